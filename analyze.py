@@ -0,0 +1,203 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import chess
+import chess.pgn
+import engine
+import timeman
+
+DEFAULT_DEPTH = 4
+PENDING_PER_PROCESS = 4  # Positions queued per worker; bounds memory on large inputs
+CENTIPAWN = engine.PIECE_VALUES[chess.PAWN] / 100  # Engine score units per centipawn
+
+def read_positions(path):
+    """
+    Streams the positions of an EPD/FEN file (one position per line) or of a PGN file (the
+    position before every move of every game) as (id, root_fen, moves, error) tuples. A line
+    that is neither a FEN nor an EPD is yielded with root_fen None and the parse error, so it
+    gets an error record in the output instead of stopping the run.
+
+    Ids are stable across runs so an interrupted analysis can be resumed: the EPD "id" operation
+    or "line N" for EPD/FEN files, "game G ply P" for PGN files.
+    """
+    if path.lower().endswith(".pgn"):
+        with open(path) as pgn:
+            game_number = 0
+            while True:
+                game = chess.pgn.read_game(pgn)
+                if game is None:
+                    break
+                game_number += 1
+                root_fen = game.board().fen()
+                moves = []
+                for ply, move in enumerate(game.mainline_moves()):
+                    yield f"game {game_number} ply {ply}", root_fen, list(moves), None
+                    moves.append(move.uci())
+        return
+
+    with open(path) as lines:
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            position_id = f"line {line_number}"
+            try:
+                board = chess.Board(line)
+            except ValueError:
+                try:
+                    board, operations = chess.Board.from_epd(line)
+                except ValueError as error:
+                    yield position_id, None, [], f"invalid FEN/EPD: {error}"
+                    continue
+                position_id = str(operations.get("id", position_id))
+            yield position_id, board.fen(), [], None
+
+def completed_ids(output_path):
+    """
+    Returns the ids already written to an existing output file.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as output:
+        for line in output:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                continue  # A line cut short by an interrupted run
+    return done
+
+def drop_partial_line(output_path):
+    """
+    Truncates an output file after its last complete line, so a record cut short by an
+    interrupted run is not glued to the first record of the next one.
+    """
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, "rb+") as output:
+        end = output.seek(0, os.SEEK_END)
+        # Scan back from the end for the last newline, one block at a time
+        position = end
+        while position > 0:
+            start = max(0, position - 4096)
+            output.seek(start)
+            block = output.read(position - start)
+            if position == end and block.endswith(b"\n"):
+                return
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                output.truncate(start + newline + 1)
+                return
+            position = start
+        output.truncate(0)
+
+_limits = None
+
+def _init_worker(limits):
+    global _limits
+    _limits = limits
+
+def analyze_position(task):
+    """
+    Pool task: searches one position with the worker's engine, whose tables stay warm from one
+    position to the next. Positions that cannot be read or searched get an error record.
+    """
+    position_id, root_fen, moves, error = task
+    if error is not None:
+        return {"id": position_id, "error": error}
+    try:
+        return _analyze(position_id, root_fen, moves)
+    except Exception as error:
+        return {"id": position_id, "error": f"{type(error).__name__}: {error}"}
+
+def _analyze(position_id, root_fen, moves):
+    board = chess.Board(root_fen)
+    for move in moves:
+        board.push_uci(move)
+
+    result = {"id": position_id, "fen": board.fen(), "move": None, "score": None, "depth": 0, "nodes": 0}
+    start = time.time()
+    if not board.is_game_over():
+        soft_limit, hard_limit = timeman.allocate_time(movetime=_limits["movetime"])
+        max_depth = _limits["depth"] or engine.MAX_SEARCH_DEPTH
+        score, move, depth = engine.iterative_deepening(board, max_depth, soft_limit, hard_limit, start)
+        result["move"] = move.uci() if move else None
+        result["score"] = round(score / CENTIPAWN) if score is not None else None  # White's view
+        result["depth"] = depth
+        result["nodes"] = engine.stats.nodes + engine.stats.quiescence_nodes
+    result["time"] = time.time() - start
+    return result
+
+def analyze(input_path, output_path, processes=None, depth=None, movetime=None):
+    """
+    Analyzes every position of input_path on a pool of worker processes and appends one JSON line
+    per position to output_path as results come in. Positions already in output_path are skipped,
+    so an interrupted run picks up where it stopped. Results are written in completion order;
+    positions that could not be read or searched get an {"id", "error"} record and are skipped
+    on resume as well.
+
+    Arguments:
+    input_path: EPD/FEN or PGN file.
+    output_path: JSON lines file with the results.
+    processes: Number of worker processes (None = one per core).
+    depth: Depth limit per position.
+    movetime: Seconds per position. Without depth or movetime, positions are searched to DEFAULT_DEPTH.
+
+    Returns:
+    int: Number of positions analyzed by this run.
+    """
+    if depth is None and movetime is None:
+        depth = DEFAULT_DEPTH
+    limits = {"depth": depth, "movetime": movetime}
+    processes = processes or multiprocessing.cpu_count()
+    done = completed_ids(output_path)
+    drop_partial_line(output_path)
+
+    # The pool's feeder thread pulls tasks from this generator; the semaphore blocks it once
+    # enough positions are queued, so large inputs are never read into memory all at once.
+    # The feeder must not stay blocked when the run is interrupted: terminating the pool
+    # waits for it, so it polls the stop flag while waiting for a slot
+    slots = threading.BoundedSemaphore(processes * PENDING_PER_PROCESS)
+    stopping = threading.Event()
+
+    def tasks():
+        for task in read_positions(input_path):
+            if task[0] in done:
+                continue
+            while not slots.acquire(timeout=0.1):
+                if stopping.is_set():
+                    return
+            yield task
+
+    count = 0
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(limits,)) as pool, \
+            open(output_path, "a") as output:
+        try:
+            for result in pool.imap_unordered(analyze_position, tasks()):
+                slots.release()
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+                count += 1
+        finally:
+            stopping.set()
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch analysis of EPD/FEN or PGN files")
+    parser.add_argument("input", help="EPD/FEN file (one position per line) or PGN file")
+    parser.add_argument("-o", "--output", required=True, help="JSON lines file; existing results are kept and skipped")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--depth", type=int, default=None, help="Depth limit per position")
+    parser.add_argument("--movetime", type=float, default=None, help="Seconds per position")
+    args = parser.parse_args()
+
+    start = time.time()
+    count = analyze(args.input, args.output, args.processes, args.depth, args.movetime)
+    print(f"analyzed {count} positions in {time.time() - start:.1f} s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,789 @@
+import argparse
+import json
+import multiprocessing
+import random
+import threading
+import time
+import chess
+import chess.polyglot
+import batch_eval
+import checkmate
+import engine
+import eval_cache
+import position
+import smp
+import tactics
+import transposition
+
+CORPUS_SEED = 2024
+CORPUS_SIZE = 300
+
+def random_positions(count=CORPUS_SIZE, seed=CORPUS_SEED, max_plies=120):
+    """
+    Returns a deterministic corpus of positions sampled from seeded random games.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(8, max_plies)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        positions.append(board)
+    return positions
+
+def time_calls(function, calls, repeat=3):
+    """
+    Returns the best wall time in seconds of running function over all argument tuples in calls.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in calls:
+            function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# Square-by-square versions of the pawn and file predicates, kept as the reference for the
+# bitboard rewrite in engine.py
+
+def legacy_is_open_file(board, square):
+    file = chess.square_file(square)
+    for rank in range(8):
+        piece = board.piece_at(chess.square(file, rank))
+        if piece and piece.piece_type == chess.PAWN:
+            return False
+    return True
+
+def legacy_is_semi_open_file(board, square, color):
+    file = chess.square_file(square)
+    for rank in range(8):
+        piece = board.piece_at(chess.square(file, rank))
+        if piece and piece.piece_type == chess.PAWN and piece.color == color:
+            return False
+    return True
+
+def legacy_is_passed_pawn(board, square, color):
+    file = chess.square_file(square)
+    direction = 1 if color == chess.WHITE else -1
+    for f in range(max(0, file - 1), min(7, file + 1) + 1):
+        for r in range(chess.square_rank(square) + direction, 8 if color == chess.WHITE else -1, direction):
+            test_square = chess.square(f, r)
+            if board.piece_at(test_square) and board.piece_at(test_square).piece_type == chess.PAWN and board.piece_at(test_square).color != color:
+                return False
+    return True
+
+def legacy_has_doubled_pawn(pawns, file):
+    return sum(1 for square in pawns if chess.square_file(square) == file) > 1
+
+def legacy_is_isolated_pawn(board, square, color):
+    file = chess.square_file(square)
+    pawns = board.pieces(chess.PAWN, color)
+    for adj_file in [file - 1, file + 1]:
+        if 0 <= adj_file <= 7 and any(chess.square_file(pawn) == adj_file for pawn in pawns):
+            return False
+    return True
+
+def legacy_is_backward_pawn(board, square, color):
+    file = chess.square_file(square)
+    direction = 1 if color == chess.WHITE else -1
+    pawns = board.pieces(chess.PAWN, color)
+    for adj_file in [file - 1, file + 1]:
+        if 0 <= adj_file <= 7:
+            for adj_rank in range(chess.square_rank(square) + direction, 8 if color == chess.WHITE else -1, direction):
+                if chess.square(adj_file, adj_rank) in pawns:
+                    return False
+    for r in range(chess.square_rank(square) + direction, 8 if color == chess.WHITE else -1, direction):
+        test_square = chess.square(file, r)
+        if board.piece_at(test_square) and board.piece_at(test_square).piece_type == chess.PAWN and board.piece_at(test_square).color != color:
+            return True
+    return False
+
+def bench_pawn_predicates(positions):
+    """
+    Checks that the bitboard predicates agree with the square-by-square versions on every
+    square of every position, then times both.
+    """
+    file_calls = [(board, square) for board in positions for square in chess.SQUARES]
+    color_calls = [(board, square, color) for board, square in file_calls for color in chess.COLORS]
+    doubled_calls = [(board.pieces(chess.PAWN, color), file) for board in positions for color in chess.COLORS for file in range(8)]
+
+    pairs = [
+        ("is_open_file", legacy_is_open_file, engine.is_open_file, file_calls),
+        ("is_semi_open_file", legacy_is_semi_open_file, engine.is_semi_open_file, color_calls),
+        ("is_passed_pawn", legacy_is_passed_pawn, engine.is_passed_pawn, color_calls),
+        ("has_doubled_pawn", legacy_has_doubled_pawn, engine.has_doubled_pawn, doubled_calls),
+        ("is_isolated_pawn", legacy_is_isolated_pawn, engine.is_isolated_pawn, color_calls),
+        ("is_backward_pawn", legacy_is_backward_pawn, engine.is_backward_pawn, color_calls),
+    ]
+
+    all_match = True
+    for name, legacy, current, calls in pairs:
+        mismatches = sum(1 for args in calls if bool(legacy(*args)) != bool(current(*args)))
+        all_match = all_match and mismatches == 0
+        legacy_time = time_calls(legacy, calls)
+        current_time = time_calls(current, calls)
+        print(f"{name:18} {len(calls):7} calls  legacy {legacy_time * 1000:8.1f} ms  "
+              f"bitboard {current_time * 1000:7.1f} ms  speedup {legacy_time / current_time:5.1f}x  "
+              f"mismatches {mismatches}")
+    return all_match
+
+# Thread-per-detector version of tactics.evaluate_tactics, kept as the reference for the
+# single-pass rewrite
+
+def legacy_detect_forks(board, attacks_cache, result, index):
+    fork_score = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece is None or piece.piece_type not in {chess.KNIGHT, chess.QUEEN, chess.PAWN}:
+            continue
+
+        if piece.piece_type == chess.PAWN:
+            pawn_attack_squares = board.attacks(square)
+            targets = [target for target in pawn_attack_squares
+                       if board.piece_at(target) and tactics.piece_values[board.piece_at(target).piece_type] > tactics.piece_values[chess.PAWN]]
+        else:
+            targets = [target for target in board.attacks(square)
+                       if board.piece_at(target) and tactics.piece_values[board.piece_at(target).piece_type] > tactics.piece_values[piece.piece_type]]
+
+        if len(targets) >= 2:
+            fork_score += sum(tactics.piece_values[board.piece_at(target).piece_type] for target in targets)
+
+    result[index] = fork_score
+
+def legacy_detect_skewers(board, attacks_cache, result, index):
+    skewer_score = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece is None or piece.piece_type not in {chess.BISHOP, chess.ROOK, chess.QUEEN}:
+            continue
+
+        for target_square in board.attacks(square):
+            if board.piece_at(target_square) and board.is_pinned(not board.turn, target_square):
+                skewer_score += tactics.piece_values[board.piece_at(target_square).piece_type]
+
+    result[index] = skewer_score
+
+def legacy_detect_pins(board, attacks_cache, result, index):
+    pin_score = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece is None or piece.piece_type not in {chess.BISHOP, chess.ROOK, chess.QUEEN}:
+            continue
+
+        for target_square in board.attacks(square):
+            if board.is_pinned(not board.turn, target_square):
+                pinned_piece = board.piece_at(target_square)
+                if pinned_piece:
+                    pin_score += tactics.piece_values[pinned_piece.piece_type]
+
+    result[index] = pin_score
+
+def legacy_detect_discovered_attacks(board, attacks_cache, result, index):
+    discovered_attack_score = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece and piece.piece_type in {chess.BISHOP, chess.ROOK, chess.QUEEN}:
+            for target_square in board.attacks(square):
+                if board.is_pinned(not board.turn, square) and board.piece_at(target_square):
+                    discovered_attack_score += tactics.piece_values[board.piece_at(target_square).piece_type]
+
+    result[index] = discovered_attack_score
+
+LEGACY_DETECTORS = [legacy_detect_forks, legacy_detect_skewers, legacy_detect_pins, legacy_detect_discovered_attacks]
+
+def legacy_tactic_components(board):
+    attacks_cache = {square: board.attacks(square) for square in chess.SQUARES}
+    result = [0] * 4
+    threads = [threading.Thread(target=detector, args=(board, attacks_cache, result, index))
+               for index, detector in enumerate(LEGACY_DETECTORS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return tuple(result)
+
+def legacy_evaluate_tactics(board):
+    if board.is_game_over() or board.fullmove_number < 5:
+        return 0
+    if not (board.pieces(chess.QUEEN, chess.WHITE) or board.pieces(chess.QUEEN, chess.BLACK) or
+            board.pieces(chess.ROOK, chess.WHITE) or board.pieces(chess.ROOK, chess.BLACK)):
+        return 0
+    return sum(legacy_tactic_components(board)) * 2
+
+def bench_tactics(positions):
+    """
+    Checks that the single-pass tactic detector returns the same fork/skewer/pin/discovered
+    components as the threaded detectors on every position, then times both evaluators.
+    """
+    mismatches = 0
+    for board in positions:
+        if legacy_tactic_components(board) != tactics.tactic_components(board):
+            mismatches += 1
+        elif legacy_evaluate_tactics(board) != tactics.evaluate_tactics(board):
+            mismatches += 1
+
+    calls = [(board,) for board in positions]
+    legacy_time = time_calls(legacy_evaluate_tactics, calls)
+    current_time = time_calls(tactics.evaluate_tactics, calls)
+    print(f"evaluate_tactics   {len(calls):7} calls  threaded {legacy_time * 1000:8.1f} ms  "
+          f"single-pass {current_time * 1000:7.1f} ms  speedup {legacy_time / current_time:5.1f}x  "
+          f"mismatches {mismatches}")
+    return mismatches == 0
+
+# Positions with a forced mate for the side to move, with the mate length in plies after the
+# mating side's first move (the scale returned by checkmate.detect_mate)
+MATE_POSITIONS = [
+    ("r2qkb1r/pp2nppp/3p4/2pNN1B1/2BnP3/3P4/PPP2PPP/R2bK2R w KQkq - 1 1", 2),
+    ("kbK5/pp6/1P6/8/8/8/8/R7 w - - 0 1", 2),
+    ("5rk1/1b3ppp/8/2RN4/8/8/2Q2PPP/6K1 w - - 0 1", 4),
+    ("2r3k1/p4p2/3Rp2p/1p2P1pK/8/1P4P1/P3Q2P/1q6 b - - 0 1", 4),
+    ("r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1", 4),
+    ("r4r1k/1R1R2p1/7p/8/8/3Q1Ppq/P7/6K1 w - - 0 1", 6),
+    ("8/8/8/8/8/3k4/8/3KQ3 w - - 0 1", 8),
+]
+MATE_MAX_DEPTH = 9
+MATE_TIME_LIMIT = 10.0
+# Positions without a forced mate in which the defender mates the attacker in some lines, which
+# must not be counted as mates for the attacker
+COUNTERMATE_POSITIONS = [
+    "8/5k1K/3Q1q2/8/3r4/8/4R3/8 w - - 0 1",
+    "8/4r3/8/3R4/8/3q1Q2/5K1k/8 b - - 0 1",
+]
+
+def bench_mate_solvers(positions):
+    """
+    Solves the known mate positions with the full-width and the proof-number backends of
+    checkmate.detect_mate and reports the time each needs, then checks that both backends agree
+    on the mate positions and on COUNTERMATE_POSITIONS. The random corpus is not used.
+    """
+    all_correct = True
+    with checkmate.MateSearchPool() as pool:
+        for fen, expected in MATE_POSITIONS:
+            row = f"mate in {expected:2} plies  "
+            for backend in ("full-width", "pns"):
+                start = time.perf_counter()
+                mate_in, move = checkmate.detect_mate(fen, MATE_MAX_DEPTH, MATE_TIME_LIMIT, pool=pool, backend=backend)
+                elapsed = time.perf_counter() - start
+                if mate_in is None:
+                    result = "unsolved"
+                else:
+                    result = f"{move.uci()} ({mate_in})"
+                # The full-width search may run out of time; a wrong answer is a failure
+                if (mate_in is not None and mate_in != expected) or (backend == "pns" and mate_in is None):
+                    all_correct = False
+                row += f"{backend:10} {elapsed:7.2f} s {result:14}  "
+            print(row + fen)
+
+    # Both backends must agree at the engine's own mate search depth and one ply less
+    agreement_positions = COUNTERMATE_POSITIONS + [fen for fen, plies in MATE_POSITIONS
+                                                   if plies < engine.MATE_SEARCH_DEPTH]
+    mismatches = 0
+    for fen in agreement_positions:
+        for depth in (engine.MATE_SEARCH_DEPTH - 1, engine.MATE_SEARCH_DEPTH):
+            full_width, _ = checkmate.detect_mate(fen, depth, backend="full-width")
+            proof_number, _ = checkmate.detect_mate(fen, depth, backend="pns")
+            if full_width != proof_number:
+                mismatches += 1
+                print(f"depth {depth}: full-width {full_width}  pns {proof_number}  {fen}")
+    print(f"backend mismatches: {mismatches} in {len(agreement_positions)} positions")
+    return all_correct and mismatches == 0
+
+# Middlegame and endgame positions searched by the search benchmarks
+SEARCH_POSITIONS = [
+    "r2q1rk1/pp2bppp/2n1pn2/3p4/3P4/2NBPN2/PP3PPP/R2Q1RK1 w - - 0 11",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 6",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10",
+    "2r2rk1/pp1bqppp/2n1p3/3pP3/3P4/P1PB1N2/5PPP/R2QR1K1 b - - 0 15",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 40",
+    "6k1/5pp1/4p2p/8/3P4/4PK2/5PPP/8 b - - 0 35",
+]
+PRUNING_DEPTH = 4
+PRUNING_SWITCHES = ["USE_NULL_MOVE_PRUNING", "USE_LATE_MOVE_REDUCTIONS", "USE_FUTILITY_PRUNING"]
+
+def run_search(fen, depth):
+    """
+    Runs a fresh fixed-depth iterative deepening search and returns (best move, nodes, seconds).
+    """
+    board = chess.Board(fen)
+    engine.transposition_table.clear()
+    engine.pawn_hash_table.clear()
+    engine.evaluation_cache.clear()
+    engine.move_orderer.clear()
+    start = time.perf_counter()
+    _, move, _ = engine.iterative_deepening(board, depth)
+    elapsed = time.perf_counter() - start
+    return move, engine.stats.nodes + engine.stats.quiescence_nodes, elapsed
+
+def bench_pruning(positions):
+    """
+    Searches SEARCH_POSITIONS to PRUNING_DEPTH with no selective pruning, with each technique
+    on its own and with all of them, reporting nodes, time and how often the best move matches
+    the unpruned search. The random corpus is not used.
+    """
+    saved = {name: getattr(engine, name) for name in PRUNING_SWITCHES}
+    configurations = [("none", [])] + [(name, [name]) for name in PRUNING_SWITCHES] + [("all", PRUNING_SWITCHES)]
+    reference_moves = None
+    try:
+        for label, enabled in configurations:
+            for name in PRUNING_SWITCHES:
+                setattr(engine, name, name in enabled)
+            results = [run_search(fen, PRUNING_DEPTH) for fen in SEARCH_POSITIONS]
+            moves = [move for move, _, _ in results]
+            if reference_moves is None:
+                reference_moves = moves
+            same = sum(1 for move, reference in zip(moves, reference_moves) if move == reference)
+            nodes = sum(nodes for _, nodes, _ in results)
+            elapsed = sum(elapsed for _, _, elapsed in results)
+            print(f"{label:26} nodes {nodes:8}  time {elapsed:7.2f} s  "
+                  f"same best move {same}/{len(SEARCH_POSITIONS)}")
+    finally:
+        for name, value in saved.items():
+            setattr(engine, name, value)
+
+EVALUATION_CACHE_SIZES = [1 << 10, 1 << 13, eval_cache.DEFAULT_ENTRIES]
+
+def bench_evaluation_cache(positions):
+    """
+    Searches SEARCH_POSITIONS to PRUNING_DEPTH without the evaluation cache and with caches of
+    several sizes, reporting time, hit rate and evictions. Cached evaluations are exact, so the
+    node counts and moves must not change. The random corpus is not used.
+    """
+    saved_size = engine.evaluation_cache.size
+    reference = None
+    try:
+        for size in [None] + EVALUATION_CACHE_SIZES:
+            engine.USE_EVALUATION_CACHE = size is not None
+            if size is not None:
+                engine.evaluation_cache.resize(size)
+            hits = misses = evictions = 0
+            results = []
+            for fen in SEARCH_POSITIONS:
+                results.append(run_search(fen, PRUNING_DEPTH))
+                hits += engine.evaluation_cache.hits
+                misses += engine.evaluation_cache.misses
+                evictions += engine.evaluation_cache.evictions
+            summary = [(move, nodes) for move, nodes, _ in results]
+            if reference is None:
+                reference = summary
+            elapsed = sum(elapsed for _, _, elapsed in results)
+            label = "no cache" if size is None else f"{size} entries"
+            row = f"{label:14} time {elapsed:7.2f} s"
+            if size is not None:
+                row += f"  hit rate {hits / max(1, hits + misses):5.1%}  evictions {evictions:7}"
+            print(row + ("" if summary == reference else "  RESULTS DIFFER"))
+            if summary != reference:
+                return False
+    finally:
+        engine.USE_EVALUATION_CACHE = True
+        engine.evaluation_cache.resize(saved_size)
+        engine.evaluation_cache.clear()
+    return True
+
+SMP_DEPTH = 5
+
+def smp_process_counts():
+    """
+    Worker counts of the scaling report: powers of two up to the number of cores, and the
+    number of cores itself.
+    """
+    cores = multiprocessing.cpu_count()
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+def bench_smp(positions):
+    """
+    Lazy SMP scaling report: searches SEARCH_POSITIONS to SMP_DEPTH with an increasing number
+    of worker processes, reporting total nodes, nodes per second and time to depth, with the
+    speedup over a single worker. The random corpus is not used.
+    """
+    baseline = None
+    for processes in smp_process_counts():
+        nodes = 0
+        elapsed = 0.0
+        with smp.LazySMPSearch(processes, engine.TT_SIZE_MB) as search:
+            for fen in SEARCH_POSITIONS:
+                search.table.clear()
+                start = time.perf_counter()
+                search.search(chess.Board(fen), SMP_DEPTH)
+                elapsed += time.perf_counter() - start
+                nodes += search.nodes
+        if baseline is None:
+            baseline = elapsed
+        print(f"{processes:3} processes  nodes {nodes:9}  nps {nodes / elapsed:9.0f}  "
+              f"time to depth {SMP_DEPTH} {elapsed:7.2f} s  speedup {baseline / elapsed:5.2f}x")
+
+BRANCHING_BUCKETS = [(1, 19), (20, 34), (35, 49), (50, 256)]
+
+def bench_batch_eval(positions):
+    """
+    Compares evaluating every child of a position with engine.evaluate_board against
+    batch_eval.evaluate_children, grouped by the number of children. Also times the vectorized
+    material, piece-square and pawn terms on their own against computing them child by child.
+    """
+    if not batch_eval.HAVE_NUMPY:
+        print("numpy is not installed; batch_eval falls back to engine.evaluate_board")
+    engine.USE_EVALUATION_CACHE = False  # Repeated timing runs would only measure cache hits
+    try:
+        return compare_batch_eval(positions)
+    finally:
+        engine.USE_EVALUATION_CACHE = True
+
+def compare_batch_eval(positions):
+
+    def loop_children(board, moves):
+        values = []
+        for move in moves:
+            board.push(move)
+            values.append(engine.evaluate_board(board))
+            board.pop()
+        return values
+
+    def loop_vectorized_terms(board, moves):
+        for move in moves:
+            board.push(move)
+            is_endgame_phase = engine.is_endgame(board)
+            engine.evaluate_material_and_position(board, is_endgame_phase)
+            engine.evaluate_pawn_terms(board, is_endgame_phase)
+            board.pop()
+
+    mismatches = 0
+    for low, high in BRANCHING_BUCKETS:
+        calls = [(board, list(board.legal_moves)) for board in positions
+                 if low <= board.legal_moves.count() <= high]
+        if not calls:
+            continue
+        children = sum(len(moves) for _, moves in calls)
+        for board, moves in calls:
+            if loop_children(board, moves) != batch_eval.evaluate_children(board, moves):
+                mismatches += 1
+
+        engine.pawn_hash_table.clear()
+        loop_time = time_calls(loop_children, calls)
+        batch_time = time_calls(batch_eval.evaluate_children, calls)
+        row = (f"{low:3}-{high:<3} children  {len(calls):4} positions  evaluate_board {loop_time * 1e6 / children:6.1f} us/child  "
+               f"batched {batch_time * 1e6 / children:6.1f} us/child  speedup {loop_time / batch_time:4.2f}x")
+        if batch_eval.HAVE_NUMPY:
+            terms_time = time_calls(loop_vectorized_terms, calls)
+            vectorized_time = time_calls(lambda board, moves: batch_eval.vectorized_terms(batch_eval.child_codes(board, moves)), calls)
+            row += (f"  | table terms {terms_time * 1e6 / children:5.1f} vs {vectorized_time * 1e6 / children:5.1f} us/child")
+        print(row)
+    print(f"positions with mismatching evaluations: {mismatches}")
+    return mismatches == 0
+
+# Perft positions: the start position and well-known move generator test positions (castling,
+# en passant, promotions, pins and checks)
+PERFT_POSITIONS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+]
+PERFT_DEPTH = 3
+MATE_SEARCH_POSITIONS = 6  # The shorter mates of MATE_POSITIONS, searched one ply past the mate
+
+def legacy_perft(board, depth):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += legacy_perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+def legacy_search_mate(board, depth, is_maximizing_player):
+    """
+    checkmate.search_mate on chess.Board, kept as the reference for the Position version.
+    """
+    if board.is_checkmate():
+        return 0, None
+    if depth == 0 or board.is_game_over():
+        return None, None
+    best_mate_in = None
+    best_move = None
+    for move in board.legal_moves:
+        board.push(move)
+        mate_in, _ = legacy_search_mate(board, depth - 1, not is_maximizing_player)
+        board.pop()
+        if is_maximizing_player:
+            if mate_in is not None and (best_mate_in is None or mate_in + 1 < best_mate_in):
+                best_mate_in = mate_in + 1
+                best_move = move
+        elif mate_in is None:
+            return None, None
+        elif best_mate_in is None or mate_in + 1 > best_mate_in:
+            best_mate_in = mate_in + 1
+    return best_mate_in, best_move
+
+def position_mismatch(board):
+    """
+    Returns a description of the first difference between board and its Position, or None.
+    """
+    compact = position.Position.from_board(board)
+    moves = [transposition.decode_move(move) for move in compact.legal_moves()]
+    if compact.zobrist != chess.polyglot.zobrist_hash(board):
+        return "zobrist"
+    if sorted(moves, key=chess.Move.uci) != sorted(board.legal_moves, key=chess.Move.uci):
+        return "legal moves"
+    if not board.is_check() and moves != list(board.legal_moves):
+        return "move order"
+    if (compact.is_check(), compact.is_checkmate(), compact.is_insufficient_material()) != \
+            (board.is_check(), board.is_checkmate(), board.is_insufficient_material()):
+        return "game state"
+    for move in moves:
+        undo = compact.make(transposition.encode_move(move))
+        board.push(move)
+        same = compact.zobrist == chess.polyglot.zobrist_hash(board) and compact.to_board().board_fen() == board.board_fen()
+        board.pop()
+        compact.unmake(transposition.encode_move(move), undo)
+        if not same:
+            return f"make {move.uci()}"
+    if compact.to_board().fen() != board.fen():
+        return "unmake"
+    return None
+
+def bench_position(positions):
+    """
+    Checks position.Position against python-chess on the corpus (zobrist keys, legal moves and
+    their order, game state, make/unmake of every move) and compares the speed of perft and of
+    the mate search on both representations.
+    """
+    mismatches = 0
+    for board in positions:
+        problem = position_mismatch(board)
+        if problem is not None:
+            mismatches += 1
+            print(f"mismatch ({problem}): {board.fen()}")
+
+    for fen in PERFT_POSITIONS:
+        board = chess.Board(fen)
+        compact = position.Position.from_board(board)
+        start = time.perf_counter()
+        nodes = position.perft(compact, PERFT_DEPTH)
+        compact_time = time.perf_counter() - start
+        start = time.perf_counter()
+        reference_nodes = legacy_perft(board, PERFT_DEPTH)
+        reference_time = time.perf_counter() - start
+        if nodes != reference_nodes:
+            mismatches += 1
+        print(f"perft {PERFT_DEPTH} {nodes:8} nodes  Position {compact_time:6.2f} s  "
+              f"python-chess {reference_time:6.2f} s  speedup {reference_time / compact_time:4.2f}x  {fen}")
+
+    for fen, expected in MATE_POSITIONS[:MATE_SEARCH_POSITIONS]:
+        board = chess.Board(fen)
+        depth = min(expected + 1, 5)
+        start = time.perf_counter()
+        result = checkmate.search_mate(board, depth, True, None, None)
+        compact_time = time.perf_counter() - start
+        start = time.perf_counter()
+        reference = legacy_search_mate(board, depth, True)
+        reference_time = time.perf_counter() - start
+        if result != reference:
+            mismatches += 1
+        print(f"mate search depth {depth}  Position {compact_time:6.2f} s  python-chess {reference_time:6.2f} s  "
+              f"speedup {reference_time / compact_time:4.2f}x  {fen}")
+    print(f"mismatches: {mismatches}")
+    return mismatches == 0
+
+def legacy_mate_in_one(board):
+    for move in board.legal_moves:
+        board.push(move)
+        mate = board.is_checkmate()
+        board.pop()
+        if mate:
+            return move
+    return None
+
+def legacy_mate_threats(board):
+    """
+    The moves after which the opponent has a mate in one, by pushing every reply of every move.
+    """
+    threats = set()
+    for move in board.legal_moves:
+        board.push(move)
+        if legacy_mate_in_one(board) is not None:
+            threats.add(move)
+        board.pop()
+    return threats
+
+def bench_checking_moves(positions):
+    """
+    Checks position.Position.generate_checking_moves against python-chess gives_check on the
+    corpus, then times mate in one detection and mate threat detection (a mate in one for the
+    opponent after every root move) on its middlegame positions: pushing every move against
+    the checking move generator.
+    """
+    mismatches = 0
+    for board in positions:
+        compact = position.Position.from_board(board)
+        checks = set(transposition.decode_move(move) for move in compact.generate_checking_moves())
+        if checks != set(move for move in board.legal_moves if board.gives_check(move)):
+            mismatches += 1
+            print(f"mismatch: {board.fen()}")
+
+    middlegames = [board for board in positions if not engine.is_endgame(board)]
+    calls = [(board,) for board in middlegames]
+    for board in middlegames:
+        same_mate = (legacy_mate_in_one(board) is None) == (engine.detect_mate_in_one(board) is None)
+        if not same_mate or legacy_mate_threats(board) != set(engine.RootMoves(board).refutations):
+            mismatches += 1
+            print(f"mismatch: {board.fen()}")
+
+    for label, legacy, compact in [("mate in one", legacy_mate_in_one, engine.detect_mate_in_one),
+                                   ("mate threats", legacy_mate_threats, engine.RootMoves)]:
+        legacy_time = time_calls(legacy, calls, repeat=1)
+        compact_time = time_calls(compact, calls, repeat=1)
+        print(f"{label:13} {len(calls)} middlegame positions  push every move {legacy_time * 1e3 / len(calls):7.2f} ms  "
+              f"checking moves {compact_time * 1e3 / len(calls):7.2f} ms  speedup {legacy_time / compact_time:5.2f}x")
+    print(f"mismatches: {mismatches}")
+    return mismatches == 0
+
+# Fixed positions and depths of the benchmark suite; the total node count of their searches is
+# the signature that changes whenever the search or the evaluation does
+SUITE_POSITIONS = ([("middlegame", fen, 5) for fen in SEARCH_POSITIONS[:4]] +
+                   [("endgame", fen, 7) for fen in SEARCH_POSITIONS[4:]])
+
+def suite_search(fen, depth):
+    """
+    Runs a fresh fixed-depth search and returns its result with the time to reach each depth.
+    """
+    board = chess.Board(fen)
+    engine.transposition_table.clear()
+    engine.pawn_hash_table.clear()
+    engine.evaluation_cache.clear()
+    engine.move_orderer.clear()
+    time_to_depth = {}
+    start = time.perf_counter()
+
+    def report(completed_depth, score, pv):
+        time_to_depth[completed_depth] = time.perf_counter() - start
+
+    score, move, _ = engine.iterative_deepening(board, depth, report=report)
+    elapsed = time.perf_counter() - start
+    nodes = engine.stats.nodes + engine.stats.quiescence_nodes
+    return {
+        "fen": fen,
+        "depth": depth,
+        "move": move.uci(),
+        "score": score,
+        "nodes": nodes,
+        "time": elapsed,
+        "nps": nodes / elapsed,
+        "time_to_depth": time_to_depth,
+    }
+
+def run_suite(positions):
+    """
+    Runs the benchmark suite and returns its results as a dictionary: the searches of
+    SUITE_POSITIONS, evaluate_board and evaluate_tactics throughput on the random corpus, and
+    the proof-number mate solve times of MATE_POSITIONS. The node signature only depends on
+    the code, not on the machine.
+    """
+    searches = []
+    for category, fen, depth in SUITE_POSITIONS:
+        result = suite_search(fen, depth)
+        result["category"] = category
+        searches.append(result)
+    nodes = sum(result["nodes"] for result in searches)
+    search_time = sum(result["time"] for result in searches)
+
+    # Throughput of the evaluation itself: repeated calls would otherwise hit the cache
+    calls = [(board,) for board in positions]
+    engine.pawn_hash_table.clear()
+    engine.USE_EVALUATION_CACHE = False
+    try:
+        evaluation_time = time_calls(engine.evaluate_board, calls)
+    finally:
+        engine.USE_EVALUATION_CACHE = True
+    tactics_time = time_calls(tactics.evaluate_tactics, calls)
+
+    mates = []
+    for fen, expected in MATE_POSITIONS:
+        start = time.perf_counter()
+        mate_in, move = checkmate.detect_mate(fen, MATE_MAX_DEPTH, MATE_TIME_LIMIT, backend="pns")
+        mates.append({
+            "fen": fen,
+            "expected": expected,
+            "mate_in": mate_in,
+            "move": move.uci() if move else None,
+            "time": time.perf_counter() - start,
+        })
+
+    return {
+        "signature": nodes,
+        "nodes": nodes,
+        "search_time": search_time,
+        "nps": nodes / search_time,
+        "evaluations_per_second": len(calls) / evaluation_time,
+        "tactics_per_second": len(calls) / tactics_time,
+        "mate_time": sum(mate["time"] for mate in mates),
+        "mates_solved": sum(1 for mate in mates if mate["mate_in"] == mate["expected"]),
+        "searches": searches,
+        "mates": mates,
+    }
+
+def bench_suite(positions):
+    """
+    Prints the results of run_suite. Fails when a mate position is not solved correctly.
+    """
+    results = run_suite(positions)
+    for search in results["searches"]:
+        depths = " ".join(f"{depth}:{seconds:.2f}" for depth, seconds in search["time_to_depth"].items())
+        print(f"{search['category']:10} depth {search['depth']}  {search['move']:6} nodes {search['nodes']:8}  "
+              f"nps {search['nps']:7.0f}  time to depth {depths}")
+    for mate in results["mates"]:
+        print(f"mate in {mate['expected']:2} plies  {mate['time']:6.2f} s  {mate['move'] or 'unsolved':6} "
+              f"({mate['mate_in']})  {mate['fen']}")
+    print(f"search       nodes {results['nodes']}  time {results['search_time']:.2f} s  nps {results['nps']:.0f}")
+    print(f"evaluation   {results['evaluations_per_second']:.0f} evaluate_board calls/s  "
+          f"{results['tactics_per_second']:.0f} evaluate_tactics calls/s")
+    print(f"mates        {results['mates_solved']}/{len(MATE_POSITIONS)} solved in {results['mate_time']:.2f} s")
+    print(f"signature    {results['signature']}")
+    return results["mates_solved"] == len(MATE_POSITIONS)
+
+BENCHMARKS = {
+    "pawn-predicates": bench_pawn_predicates,
+    "tactics": bench_tactics,
+    "mate-solvers": bench_mate_solvers,
+    "pruning": bench_pruning,
+    "batch-eval": bench_batch_eval,
+    "eval-cache": bench_evaluation_cache,
+    "position": bench_position,
+    "checking-moves": bench_checking_moves,
+    "smp": bench_smp,
+    "suite": bench_suite,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine benchmarks")
+    parser.add_argument("benchmark", nargs="?", default="suite", choices=sorted(BENCHMARKS),
+                        help="Benchmark to run (default: the fixed benchmark suite)")
+    parser.add_argument("--positions", type=int, default=CORPUS_SIZE, help="Size of the random position corpus")
+    parser.add_argument("--json", action="store_true", help="Print the suite results as JSON")
+    args = parser.parse_args()
+
+    if args.json:
+        if args.benchmark != "suite":
+            parser.error("--json is only supported by the suite benchmark")
+        results = run_suite(random_positions(args.positions))
+        results["timestamp"] = time.time()
+        results["corpus_size"] = args.positions
+        print(json.dumps(results, indent=2))
+        return
+
+    ok = BENCHMARKS[args.benchmark](random_positions(args.positions))
+    if ok is False:
+        print("FAILED: results differ from the reference implementation")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
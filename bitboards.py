@@ -0,0 +1,37 @@
+import chess
+
+# Squares on each file
+FILE_MASKS = list(chess.BB_FILES)
+
+# Squares on the files left and right of each file
+ADJACENT_FILE_MASKS = [
+    (chess.BB_FILES[file - 1] if file > 0 else 0) | (chess.BB_FILES[file + 1] if file < 7 else 0)
+    for file in range(8)
+]
+
+def _ranks_ahead(color, rank):
+    """
+    Returns the mask of all ranks strictly in front of rank from color's point of view.
+    """
+    mask = 0
+    ranks = range(rank + 1, 8) if color == chess.WHITE else range(rank)
+    for r in ranks:
+        mask |= chess.BB_RANKS[r]
+    return mask
+
+# Indexed [color][square]: squares strictly in front of the square on its own file
+FORWARD_SPAN = [[0] * 64, [0] * 64]
+
+# Indexed [color][square]: squares strictly in front of the square on the adjacent files
+ADJACENT_FORWARD_SPAN = [[0] * 64, [0] * 64]
+
+# Indexed [color][square]: squares an enemy pawn must not occupy for a pawn there to be passed
+PASSED_PAWN_MASKS = [[0] * 64, [0] * 64]
+
+for _color in chess.COLORS:
+    for _square in chess.SQUARES:
+        _ahead = _ranks_ahead(_color, chess.square_rank(_square))
+        _file = chess.square_file(_square)
+        FORWARD_SPAN[_color][_square] = _ahead & FILE_MASKS[_file]
+        ADJACENT_FORWARD_SPAN[_color][_square] = _ahead & ADJACENT_FILE_MASKS[_file]
+        PASSED_PAWN_MASKS[_color][_square] = FORWARD_SPAN[_color][_square] | ADJACENT_FORWARD_SPAN[_color][_square]
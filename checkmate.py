@@ -1,24 +1,53 @@
 import chess
 import time
 import multiprocessing
+import pns
+import position
+import transposition
 
-def search_mate(board, depth, is_maximizing_player, time_limit, start_time):
+def search_mate(board, depth, is_maximizing_player, time_limit, start_time, stop=None):
+    """
+    Full-width search for the quickest forced mate by the maximizing player within depth plies.
+    board may be a chess.Board or a position.Position; the search itself runs on a Position
+    (a position.BoardPosition for Chess960 boards).
+
+    Returns:
+    tuple: (mate_in, move) where mate_in counts the plies until mate, or (None, None).
+    """
+    if isinstance(board, chess.Board):
+        board = position.from_board(board)
+    mate_in, move = _search_mate(board, depth, is_maximizing_player, time_limit, start_time, stop)
+    return mate_in, transposition.decode_move(move)
+
+def _search_mate(board, depth, is_maximizing_player, time_limit, start_time, stop):
     if time_limit and (time.time() - start_time >= time_limit):
         return None, None
-    if board.is_checkmate():
-        return 0, None
-    if depth == 0 or board.is_game_over():
+    if stop is not None and stop():
         return None, None
 
+    if depth == 0:
+        # Only the defender being mated counts; the attacker being mated is no forced mate
+        return (0, None) if not is_maximizing_player and board.is_checkmate() else (None, None)
+    if board.is_insufficient_material() or board.halfmove_clock >= 150:
+        return None, None  # Draw, or checkmate is impossible
+    if is_maximizing_player and depth == 1:
+        # On the last attacker ply only a checking move can mate
+        move = board.mate_in_one()
+        if move is not None:
+            return 1, move
+        return None, None  # No mate, or the attacker is mated or stalemated
+
     best_mate_in = None
     best_move = None
+    has_moves = False  # Moves are generated lazily, so mate and stalemate are found at the end
 
     if is_maximizing_player:
         # Try to find the quickest mate for the current player
-        for move in board.legal_moves:
-            board.push(move)
-            mate_in, _ = search_mate(board, depth - 1, False, time_limit, start_time)
-            board.pop()
+        for move in board.generate_legal_moves():
+            has_moves = True
+            undo = board.make(move)
+            mate_in, _ = _search_mate(board, depth - 1, False, time_limit, start_time, stop)
+            board.unmake(move, undo)
 
             if mate_in is not None:
                 if best_mate_in is None or mate_in + 1 < best_mate_in:
@@ -28,51 +57,145 @@ def search_mate(board, depth, is_maximizing_player, time_limit, start_time):
             # Time check after each move
             if time_limit and (time.time() - start_time >= time_limit):
                 return None, None
+            if stop is not None and stop():
+                return None, None
     else:
-        for move in board.legal_moves:
-            board.push(move)
-            mate_in, _ = search_mate(board, depth - 1, True, time_limit, start_time) 
-            board.pop()
+        # Every defence must be mated; the defender picks the longest
+        for move in board.generate_legal_moves():
+            has_moves = True
+            undo = board.make(move)
+            mate_in, _ = _search_mate(board, depth - 1, True, time_limit, start_time, stop)
+            board.unmake(move, undo)
 
             if mate_in is None:
                 return None, None
-              
-        best_mate_in = max(mate_in + 1 for move in board.legal_moves)
+            if best_mate_in is None or mate_in + 1 > best_mate_in:
+                best_mate_in = mate_in + 1
 
+    if not has_moves and not is_maximizing_player:
+        return (0, None) if board.is_check() else (None, None)  # Checkmate or stalemate
     return best_mate_in, best_move
 
-def search_mate_for_move(move, board_fen, depth, time_limit, start_time):
-    board = chess.Board(board_fen)
-    board.push(move)
-    mate_in, _ = search_mate(board, depth - 1, False, time_limit, start_time) 
+# Worker process state, set up by _init_worker
+_active_batch = None
+_deadline = None
+_worker_fen = None
+_worker_board = None
+
+def _init_worker(active_batch, deadline):
+    global _active_batch, _deadline
+    _active_batch = active_batch
+    _deadline = deadline
+
+def _stop_requested(batch):
+    """
+    Returns True once a worker's batch has been cancelled (a mate was found elsewhere or a
+    newer batch started) or the shared deadline has passed.
+    """
+    return _active_batch.value != batch or time.time() >= _deadline.value
+
+def _search_mate_task(task):
+    """
+    Pool task: searches one root move. The board is only rebuilt when the root position changes.
+    """
+    global _worker_fen, _worker_board
+    batch, board_fen, move, depth = task
+    if _stop_requested(batch):
+        return None, move
+    if board_fen != _worker_fen:
+        _worker_board = chess.Board(board_fen)
+        _worker_fen = board_fen
+
+    _worker_board.push(move)
+    try:
+        mate_in, _ = search_mate(_worker_board, depth - 1, False, None, None, stop=lambda: _stop_requested(batch))
+    finally:
+        _worker_board.pop()
+
+    if mate_in is not None:
+        # Tell the other workers of this batch to stop
+        with _active_batch.get_lock():
+            if _active_batch.value == batch:
+                _active_batch.value = 0
     return mate_in, move
 
-def detect_mate(fen, max_depth=20, time_limit=None):
-    board = chess.Board(fen)
-    start_time = time.time()
+class MateSearchPool:
+    """
+    Long-lived pool of mate search workers.
 
-    for depth in range(1, max_depth + 1):
-        legal_moves = list(board.legal_moves)
+    Root moves are searched in parallel and results stream back as they finish. The workers
+    share a deadline and the id of the active batch: when one worker finds a mate, or the
+    parent gives up on a batch, the remaining tasks of that batch stop early.
+    """
 
-        # Parallelize across all legal moves
-        with multiprocessing.Pool() as pool:
-            results = pool.starmap(
-                search_mate_for_move,
-                [(move, board.fen(), depth, time_limit, start_time) for move in legal_moves]
-            )
+    def __init__(self, processes=None):
+        self._active_batch = multiprocessing.Value('q', 0)
+        self._deadline = multiprocessing.Value('d', 0.0)
+        self._batch = 0
+        self._pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                          initargs=(self._active_batch, self._deadline))
 
-        # Process the results at the current depth
-        best_mate_in = None
-        best_move = None
+    def detect_mate(self, fen, max_depth=20, time_limit=None, moves=None):
+        """
+        Searches the root moves of fen (or only the given moves, in their order) for a forced mate.
+        """
+        start_time = time.time()
+        self._deadline.value = start_time + time_limit if time_limit else float('inf')
+        legal_moves = list(chess.Board(fen).legal_moves) if moves is None else moves
 
-        for mate_in, move in results:
-            if mate_in is not None:
-                if best_mate_in is None or mate_in < best_mate_in:
-                    best_mate_in = mate_in
-                    best_move = move
+        try:
+            for depth in range(1, max_depth + 1):
+                if time.time() >= self._deadline.value:
+                    break
+                self._batch += 1
+                self._active_batch.value = self._batch
+
+                tasks = [(self._batch, fen, move, depth) for move in legal_moves]
+                # Any mate found at this depth is as short as the others, so take the first one
+                for mate_in, move in self._pool.imap_unordered(_search_mate_task, tasks):
+                    if mate_in is not None:
+                        return mate_in, move
+        finally:
+            self._active_batch.value = 0
+
+        # If no mate is found after searching all depths
+        return None, None
+
+    def close(self):
+        """
+        Cancels any running batch and shuts the worker processes down.
+        """
+        if self._pool is None:
+            return
+        self._active_batch.value = 0
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def detect_mate(fen, max_depth=20, time_limit=None, pool=None, backend="full-width", node_limit=pns.DEFAULT_NODE_LIMIT,
+                moves=None):
+    """
+    Searches for a forced mate for the side to move within max_depth plies.
 
-        if best_mate_in is not None:
-            return best_mate_in, best_move
+    The "full-width" backend deepens one ply at a time, searching the root moves (all legal
+    moves, or the given moves in their order) on the given MateSearchPool (or a temporary one
+    when no pool is passed). The "pns" backend runs a proof-number search in this process,
+    bounded by node_limit, and always considers every root move.
 
-    # If no mate is found after searching all depths
-    return None, None
+    Returns:
+    tuple: (mate_in, move), or (None, None) if no mate was found within the limits.
+    """
+    if backend == "pns":
+        return pns.detect_mate(fen, max_depth, time_limit, node_limit)
+    if backend != "full-width":
+        raise ValueError(f"Unknown mate search backend: {backend}")
+    if pool is not None:
+        return pool.detect_mate(fen, max_depth, time_limit, moves)
+    with MateSearchPool() as temporary_pool:
+        return temporary_pool.detect_mate(fen, max_depth, time_limit, moves)
@@ -1,10 +1,67 @@
+import atexit
 import chess
 import tactics
 import checkmate
+import position
 import time
 import openings
+import transposition
+import pawn_hash
+import eval_cache
+import search_context
+import bitboards
+import move_ordering
+import search_stats
+import smp
+import timeman
 
 EARLY_GAME_MOVE_LIMIT = 10  # Define early game as the first 10 moves
+TT_SIZE_MB = 64  # Size of the transposition table shared by all searches
+
+MAX_SEARCH_DEPTH = 64  # Upper bound for iterative deepening on a timed search
+TIME_CHECK_INTERVAL = 16  # Nodes searched between two deadline checks
+QUIESCENCE_NODE_LIMIT = 5000  # Quiescence nodes per main search leaf; past this, its nodes only stand pat
+
+# Selective pruning in negamax; each technique can be switched off on its own for benchmarking
+USE_NULL_MOVE_PRUNING = True
+USE_LATE_MOVE_REDUCTIONS = True
+USE_FUTILITY_PRUNING = True
+NULL_MOVE_REDUCTION = 2  # Extra plies the null-move search is reduced by
+NULL_MOVE_MIN_DEPTH = 3
+LMR_MIN_DEPTH = 3
+LMR_FULL_DEPTH_MOVES = 3  # Moves searched at full depth before quiet moves get reduced
+FUTILITY_MARGINS = {1: 1000, 2: 2500}  # Remaining depth -> margin (a pawn is worth 500)
+ASPIRATION_WINDOW = 250  # Half width of the first window around the previous iteration's score
+ASPIRATION_WIDENING = 4  # Factor the window grows by after each fail low or fail high
+MATE_SEARCH_TIME = 5.0  # Seconds given to checkmate.detect_mate on an untimed move
+MATE_SEARCH_SHARE = 0.25  # Share of a timed move's budget given to checkmate.detect_mate
+MATE_SEARCH_PROCESSES = None  # Worker processes of the mate search pool (None = one per core)
+SEARCH_PROCESSES = 1  # Lazy SMP worker processes of the main search (1 = search in this process)
+MATE_SEARCH_BACKEND = "full-width"  # "full-width" (worker pool) or "pns" (proof-number search)
+MATE_SEARCH_DEPTH = 5  # Plies of the forced mate search before the main search
+MATE_SCORE = 1000000  # Score of a forced mate, beyond any static evaluation
+
+PAWN_HASH_ENTRIES = 1 << 14  # Number of pawn structures kept in the pawn hash table
+USE_EVALUATION_CACHE = True
+EVALUATION_CACHE_ENTRIES = 1 << 16  # Static evaluations kept in the evaluation cache
+
+transposition_table = transposition.TranspositionTable(TT_SIZE_MB)
+pawn_hash_table = pawn_hash.PawnHashTable(PAWN_HASH_ENTRIES)
+evaluation_cache = eval_cache.EvaluationCache(EVALUATION_CACHE_ENTRIES)
+move_orderer = move_ordering.MoveOrderer()
+stats = search_stats.SearchStats()
+
+# State of the running search, set up by iterative_deepening
+_hard_deadline = None
+_pv_moves = {}
+_evaluator = None
+_context = None
+_stop = None  # Callable that aborts the running search when it returns True
+_root_moves = None
+
+# Mate search workers, started on first use and kept for the lifetime of the engine
+_mate_pool = None
+_smp_search = None
 
 PAWN_TABLE = [
     100, 100, 100, 100, 100, 100, 100, 100,
@@ -72,6 +129,15 @@ KING_TABLE_MIDDLE = [
     20, 30, 10, 0, 0, 10, 30, 20
 ]
 
+PIECE_VALUES = {
+    chess.PAWN: 500,
+    chess.KNIGHT: 3050,
+    chess.BISHOP: 3330,
+    chess.ROOK: 5630,
+    chess.QUEEN: 9500,
+    chess.KING: 0  # King has no value, game ends if checkmated
+}
+
 KING_TABLE_ENDGAME = [
     -50, -40, -30, -20, -20, -30, -40, -50,
     -30, -20, -10, 0, 0, -10, -20, -30,
@@ -109,16 +175,115 @@ def get_positional_value(piece, square, is_white, is_endgame):
     else:
         return table[chess.square_mirror(square)]
 
+def build_piece_square_values():
+    """
+    Precomputes material plus positional value for every (piece type, color) on every square.
+    Values are signed from White's point of view and come as a (middlegame, endgame) pair of tables.
+    """
+    tables = {}
+    for piece_type, piece_value in PIECE_VALUES.items():
+        for color, factor in [(chess.WHITE, 1), (chess.BLACK, -1)]:
+            tables[(piece_type, color)] = tuple(
+                [factor * (piece_value + get_positional_value(piece_type, square, color == chess.WHITE, endgame))
+                 for square in chess.SQUARES]
+                for endgame in (False, True)
+            )
+    return tables
+
+PIECE_SQUARE_VALUES = build_piece_square_values()
+
+def evaluate_material_and_position(board, is_endgame):
+    """
+    Full recompute of the material and positional part of the evaluation.
+    """
+    phase = 1 if is_endgame else 0
+    value = 0
+    for (piece_type, color), tables in PIECE_SQUARE_VALUES.items():
+        table = tables[phase]
+        for square in board.pieces(piece_type, color):
+            value += table[square]
+    return value
+
+class IncrementalEvaluator:
+    """
+    Keeps running middlegame and endgame totals of material and positional value for a board.
+
+    The totals are computed once at the root and then updated from the move delta: use
+    push(board, move) and pop(board) instead of board.push and board.pop during the search.
+    """
+
+    def __init__(self, board):
+        self.reset(board)
+
+    def reset(self, board):
+        self.middlegame = evaluate_material_and_position(board, False)
+        self.endgame = evaluate_material_and_position(board, True)
+        self._stack = []
+
+    def material_and_position(self, is_endgame):
+        return self.endgame if is_endgame else self.middlegame
+
+    def push(self, board, move):
+        self._stack.append((self.middlegame, self.endgame))
+        if move:
+            middlegame_delta, endgame_delta = move_delta(board, move)
+            self.middlegame += middlegame_delta
+            self.endgame += endgame_delta
+        board.push(move)
+
+    def pop(self, board):
+        self.middlegame, self.endgame = self._stack.pop()
+        return board.pop()
+
+def move_delta(board, move):
+    """
+    Returns the change of the (middlegame, endgame) material and positional totals caused by
+    move, computed on the board before the move is made.
+    """
+    color = board.turn
+    from_square, to_square = move.from_square, move.to_square
+    piece_type = board.piece_type_at(from_square)
+    moved = PIECE_SQUARE_VALUES[(piece_type, color)]
+
+    if piece_type == chess.KING and board.is_castling(move):
+        rank = chess.square_rank(from_square)
+        kingside = board.is_kingside_castling(move)
+        king_to = chess.square(6 if kingside else 2, rank)
+        # Standard castling moves the king two squares, Chess960 castling "captures" the own rook
+        if board.piece_type_at(to_square) == chess.ROOK and board.color_at(to_square) == color:
+            rook_from = to_square
+        else:
+            rook_from = chess.square(7 if kingside else 0, rank)
+        rook_to = chess.square(5 if kingside else 3, rank)
+        rook = PIECE_SQUARE_VALUES[(chess.ROOK, color)]
+        return tuple(
+            moved[phase][king_to] - moved[phase][from_square] + rook[phase][rook_to] - rook[phase][rook_from]
+            for phase in (0, 1)
+        )
+
+    placed = PIECE_SQUARE_VALUES[(move.promotion, color)] if move.promotion else moved
+    captured = None
+    if board.is_en_passant(move):
+        capture_square = to_square - 8 if color == chess.WHITE else to_square + 8
+        captured = PIECE_SQUARE_VALUES[(chess.PAWN, not color)]
+    else:
+        capture_square = to_square
+        captured_type = board.piece_type_at(to_square)
+        if captured_type:
+            captured = PIECE_SQUARE_VALUES[(captured_type, not color)]
+
+    middlegame = placed[0][to_square] - moved[0][from_square]
+    endgame = placed[1][to_square] - moved[1][from_square]
+    if captured is not None:
+        middlegame -= captured[0][capture_square]
+        endgame -= captured[1][capture_square]
+    return middlegame, endgame
+
 def is_open_file(board, square):
     """
     Returns True if the file of the given square is open (i.e., no pawns on that file).
     """
-    file = chess.square_file(square)
-    for rank in range(8):
-        piece = board.piece_at(chess.square(file, rank))
-        if piece and piece.piece_type == chess.PAWN:
-            return False
-    return True
+    return not board.pawns & bitboards.FILE_MASKS[chess.square_file(square)]
 
 def evaluate_rook_activity(board):
     """
@@ -137,12 +302,7 @@ def is_semi_open_file(board, square, color):
     """
     Returns True if the file of the given square is semi-open (i.e., only opponent's pawns are on the file).
     """
-    file = chess.square_file(square)
-    for rank in range(8):
-        piece = board.piece_at(chess.square(file, rank))
-        if piece and piece.piece_type == chess.PAWN and piece.color == color:
-            return False
-    return True
+    return not board.pawns & board.occupied_co[color] & bitboards.FILE_MASKS[chess.square_file(square)]
 
 def is_piece_defended(board, square, color):
     defenders = board.attackers(color, square)
@@ -161,13 +321,7 @@ def is_mate_in_one(board, color):
     """
     Checks if the given player can deliver checkmate in one move.
     """
-    for move in board.legal_moves:
-        board.push(move)
-        if board.is_checkmate():
-            board.pop()
-            return True
-        board.pop()
-    return False
+    return position.from_board(board).mate_in_one() is not None
 
 def check_development_penalty(board, move_number, expected_development_by_move=10):
     """
@@ -182,6 +336,10 @@ def check_development_penalty(board, move_number, expected_development_by_move=1
     int: The total penalty points deducted for undeveloped pieces.
     """
 
+    # Apply penalty only if the move number is beyond the expected development stage
+    if move_number <= expected_development_by_move:
+        return 0  # No penalty before the expected development move number
+
     penalty = 0
     undeveloped_pieces = []
 
@@ -216,68 +374,45 @@ def check_development_penalty(board, move_number, expected_development_by_move=1
                     undeveloped_pieces.append(piece_type)
                     penalty += 1  # Add penalty for each undeveloped piece
 
-    # Apply penalty only if the move number is beyond the expected development stage
-    if move_number > expected_development_by_move:
-        return penalty
-    else:
-        return 0  # No penalty before the expected development move number
+    return penalty
 
 def is_passed_pawn(board, square, color):
     """
     Determines if a pawn is a passed pawn.
     A passed pawn has no opposing pawns in front of it on the same or adjacent files.
     """
-    file = chess.square_file(square)
-    direction = 1 if color == chess.WHITE else -1
-    for f in range(max(0, file - 1), min(7, file + 1) + 1):
-        for r in range(chess.square_rank(square) + direction, 8 if color == chess.WHITE else -1, direction):
-            test_square = chess.square(f, r)
-            if board.piece_at(test_square) and board.piece_at(test_square).piece_type == chess.PAWN and board.piece_at(test_square).color != color:
-                return False
-    return True
+    return not board.pawns & board.occupied_co[not color] & bitboards.PASSED_PAWN_MASKS[color][square]
 
 def has_doubled_pawn(pawns, file):
     """
     Determines if there are two pawns of the same color on the same file.
     """
-    return sum(1 for square in pawns if chess.square_file(square) == file) > 1
+    return chess.popcount(int(pawns) & bitboards.FILE_MASKS[file]) > 1
 
 def is_isolated_pawn(board, square, color):
     """
     Determines if a pawn is isolated.
     """
-    file = chess.square_file(square)
-    pawns = board.pieces(chess.PAWN, color)
-    for adj_file in [file - 1, file + 1]:
-        if 0 <= adj_file <= 7 and any(chess.square_file(pawn) == adj_file for pawn in pawns):
-            return False
-    return True
+    return not board.pawns & board.occupied_co[color] & bitboards.ADJACENT_FILE_MASKS[chess.square_file(square)]
 
 def is_backward_pawn(board, square, color):
     """
     Determines if a pawn is backward.
     """
-    file = chess.square_file(square)
-    direction = 1 if color == chess.WHITE else -1
-    pawns = board.pieces(chess.PAWN, color)
-    for adj_file in [file - 1, file + 1]:
-        if 0 <= adj_file <= 7:
-            for adj_rank in range(chess.square_rank(square) + direction, 8 if color == chess.WHITE else -1, direction):
-                if chess.square(adj_file, adj_rank) in pawns:
-                    return False
-    for r in range(chess.square_rank(square) + direction, 8 if color == chess.WHITE else -1, direction):
-        test_square = chess.square(file, r)
-        if board.piece_at(test_square) and board.piece_at(test_square).piece_type == chess.PAWN and board.piece_at(test_square).color != color:
-            return True
-    return False
+    if board.pawns & board.occupied_co[color] & bitboards.ADJACENT_FORWARD_SPAN[color][square]:
+        return False
+    return bool(board.pawns & board.occupied_co[not color] & bitboards.FORWARD_SPAN[color][square])
 
 
 
-def evaluate_pawn_advancement(board, color):
+def evaluate_pawn_advancement(board, color, passed=None):
     """
     Encourages pawn advancement toward promotion.
     Stronger encouragement for passed pawns in the endgame.
+    passed is the bitboard of color's passed pawns, if the caller already has it.
     """
+    if passed is None:
+        passed = passed_pawns(board, color)
     advancement_score = 0
     direction = 1 if color == chess.WHITE else -1
     rank_goal = 7 if color == chess.WHITE else 0
@@ -288,7 +423,7 @@ def evaluate_pawn_advancement(board, color):
         advancement_score += (7 - abs(rank_goal - rank)) * 10  # Encourage advancement
 
         # Additional bonus for passed pawns
-        if is_passed_pawn(board, square, color):
+        if passed & chess.BB_SQUARES[square]:
             advancement_score += 30 if is_endgame_phase else 20  # Stronger bonus in the endgame
 
         # Bonus for pawns reaching the 7th rank (or 2nd for black) since they are close to promotion
@@ -298,17 +433,20 @@ def evaluate_pawn_advancement(board, color):
     return advancement_score
 
 
-def evaluate_pawn_structure(board, is_endgame):
+def evaluate_pawn_structure(board, is_endgame, passed=None):
     """
     Evaluates pawn structure, considering passed, doubled, isolated, and backward pawns.
+    passed holds the passed pawn bitboards indexed by color, if the caller already has them.
     """
+    if passed is None:
+        passed = [passed_pawns(board, chess.BLACK), passed_pawns(board, chess.WHITE)]
     pawn_structure_score = 0
     bonuses = {"passed": (30 if is_endgame else 15), "doubled": -20, "isolated": -25, "backward": -15}
     for color, factor in [(chess.WHITE, 1), (chess.BLACK, -1)]:
         pawns = board.pieces(chess.PAWN, color)
         for square in pawns:
             file = chess.square_file(square)
-            if is_passed_pawn(board, square, color):
+            if passed[color] & chess.BB_SQUARES[square]:
                 pawn_structure_score += factor * bonuses["passed"]
             if has_doubled_pawn(pawns, file):
                 pawn_structure_score += factor * bonuses["doubled"]
@@ -318,6 +456,41 @@ def evaluate_pawn_structure(board, is_endgame):
                 pawn_structure_score += factor * bonuses["backward"]
     return pawn_structure_score * 0.5
 
+def passed_pawns(board, color):
+    """
+    Returns the bitboard of the given player's passed pawns.
+    """
+    passed = 0
+    for square in board.pieces(chess.PAWN, color):
+        if is_passed_pawn(board, square, color):
+            passed |= chess.BB_SQUARES[square]
+    return passed
+
+def evaluate_pawns(board, is_endgame_phase):
+    """
+    Looks up the pawn structure in the pawn hash table, evaluating it on a miss.
+
+    Returns:
+    tuple: (white_pawns, black_pawns, is_endgame_phase, pawn structure score, white advancement,
+    black advancement). Advancement is only computed in the endgame and is 0 otherwise.
+    """
+    white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+    black_pawns = board.pawns & board.occupied_co[chess.BLACK]
+    entry = pawn_hash_table.probe(white_pawns, black_pawns, is_endgame_phase)
+    if entry is None:
+        # Passed pawns are found once and shared by the structure and advancement terms
+        passed = [passed_pawns(board, chess.BLACK), passed_pawns(board, chess.WHITE)]
+        if is_endgame_phase:
+            white_advancement = evaluate_pawn_advancement(board, chess.WHITE, passed[chess.WHITE])
+            black_advancement = evaluate_pawn_advancement(board, chess.BLACK, passed[chess.BLACK])
+        else:
+            white_advancement = black_advancement = 0
+        entry = (white_pawns, black_pawns, is_endgame_phase,
+                 evaluate_pawn_structure(board, is_endgame_phase, passed),
+                 white_advancement, black_advancement)
+        pawn_hash_table.store(entry)
+    return entry
+
 def evaluate_queen_trade(board, material_advantage):
     """
     Evaluates whether a queen trade is favorable based on material advantage.
@@ -354,30 +527,19 @@ def penalize_early_queen_use(board):
                     penalty += factor * 2  # Double penalty for early queen use
     return penalty
 
-def penalize_multiple_piece_moves(board):
+def penalize_multiple_piece_moves(board, context=None):
     """
     Apply a penalty for moving the same piece multiple times in the early game.
-    """
-    penalty = 0
-    if is_early_game(board):
-        piece_move_count = {}
-
-        # Count moves for each piece
-        for move in board.move_stack:
-            piece_type = board.piece_type_at(move.from_square)
-            piece_color = board.color_at(move.from_square)
-
-            piece_id = (piece_color, piece_type)
-            if piece_id not in piece_move_count:
-                piece_move_count[piece_id] = 0
-            piece_move_count[piece_id] += 1
 
-        # Penalize if any piece has been moved more than once
-        for count in piece_move_count.values():
-            if count > 1:
-                penalty += (count - 1) * 50  # Adjust penalty weight as necessary
-
-    return penalty
+    Every move of a piece after its first costs search_context.REPEATED_MOVE_PENALTY. The penalty is returned
+    from White's point of view (White's penalty minus Black's). The move counts come from a
+    SearchContext in sync with the board, or from replaying the game when none is given.
+    """
+    if not is_early_game(board):
+        return 0
+    if context is None:
+        context = search_context.SearchContext(board)
+    return context.repeated_move_penalty(chess.WHITE) - context.repeated_move_penalty(chess.BLACK)
 
 def evaluate_king_safety(board, color):
     """
@@ -394,6 +556,9 @@ def evaluate_king_safety(board, color):
     # Check the three squares in front of the king (same file, adjacent files)
     for adj_file in [file - 1, file, file + 1]:
         if 0 <= adj_file <= 7:  # Ensure the file is valid
+            if not 0 <= rank + direction <= 7:
+                safety_score -= 20  # King on its last rank: no pawn can shelter it
+                continue
             pawn_square = chess.square(adj_file, rank + direction)
             piece = board.piece_at(pawn_square)
             if piece is None or piece.piece_type != chess.PAWN or piece.color != color:
@@ -414,53 +579,85 @@ def evaluate_king_safety(board, color):
     return safety_score
 
 
-def evaluate_board(board):
+def game_stage(board):
+    """
+    Bucket of the move number as the evaluation sees it: 0 before move 5 (tactics), 1 up to
+    EARLY_GAME_MOVE_LIMIT (early queen and piece moves), 2 afterwards.
+    """
+    if board.fullmove_number < 5:
+        return 0
+    return 1 if board.fullmove_number <= EARLY_GAME_MOVE_LIMIT else 2
+
+def is_drawn_by_history(board, context=None):
+    """
+    The ways board.is_game_over ends a game that depend on the move history rather than the
+    position: the seventy-five-move rule and fivefold repetition.
+    """
+    if board.halfmove_clock >= 150:
+        return True
+    return context.is_repetition(5) if context is not None else board.is_fivefold_repetition()
+
+def evaluate_board(board, evaluator=None, key=None, context=None):
     """
     Static evaluation of the board using bitboards. Positive values favor White, negative values favor Black.
     This function includes material, positional, and pawn structure evaluations.
     Additionally, it checks for mate-in-one, rook activity, and penalizes repeated positions and early queen moves.
+    When an IncrementalEvaluator that is in sync with the board is given, its running material and
+    positional totals are used instead of recomputing them.
+
+    The terms that only depend on the position and the move number are cached in
+    evaluation_cache under (Zobrist hash, game_stage, is_drawn_by_history), the last because
+    the tactics term is skipped once the game is over; key is the Zobrist hash if the caller
+    already has it. The terms that depend on the move history are added afterwards, read from
+    a SearchContext in sync with the board when one is given.
+    """
+    if not USE_EVALUATION_CACHE:
+        return evaluate_position(board, evaluator) + evaluate_history_terms(board, context)
+    if key is None:
+        key = context.key() if context is not None else transposition.board_hash(board)
+    cache_key = (key, game_stage(board), is_drawn_by_history(board, context))
+    value = evaluation_cache.probe(cache_key)
+    if value is None:
+        value = evaluate_position(board, evaluator)
+        evaluation_cache.store(cache_key, value)
+    return value + evaluate_history_terms(board, context)
+
+def evaluate_position(board, evaluator=None):
+    """
+    The terms of evaluate_board that do not depend on the move history.
     """
-    piece_values = {
-        chess.PAWN: 500,
-        chess.KNIGHT: 3050,
-        chess.BISHOP: 3330,
-        chess.ROOK: 5630,
-        chess.QUEEN: 9500,
-        chess.KING: 0  # King has no value, game ends if checkmated
-    }
-
-    value = 0
     is_endgame_phase = is_endgame(board)
 
-    # Evaluate each piece type for both players
-    for piece_type in piece_values:
-        # Get bitboards for each piece type
-        white_pieces = board.pieces(piece_type, chess.WHITE)
-        black_pieces = board.pieces(piece_type, chess.BLACK)
-
-        # Material value for each piece
-        value += len(white_pieces) * piece_values[piece_type]
-        value -= len(black_pieces) * piece_values[piece_type]
+    # Material and positional value based on the positional tables
+    if evaluator is not None:
+        value = evaluator.material_and_position(is_endgame_phase)
+    else:
+        value = evaluate_material_and_position(board, is_endgame_phase)
 
-        # Positional value based on the positional tables
-        for square in white_pieces:
-            value += get_positional_value(piece_type, square, is_white=True, is_endgame=is_endgame_phase)
+    value += evaluate_pawn_terms(board, is_endgame_phase)
+    value += evaluate_piece_terms(board)
+    return value
 
-        for square in black_pieces:
-            value -= get_positional_value(piece_type, square, is_white=False, is_endgame=is_endgame_phase)
+def evaluate_pawn_terms(board, is_endgame_phase):
+    """
+    Pawn structure, plus pawn advancement in the endgame, cached per pawn structure.
+    """
+    _, _, _, pawn_structure, white_advancement, black_advancement = evaluate_pawns(board, is_endgame_phase)
+    value = pawn_structure
+    if is_endgame_phase:
+        value += white_advancement
+        value -= black_advancement
+    return value
 
-    # Pawn structure evaluation
-    value += evaluate_pawn_structure(board, is_endgame_phase)
-    if chess.WHITE:
-        value += tactics.evaluate_tactics(board)
-    if chess.BLACK:
-        value += tactics.evaluate_tactics(board)
+def evaluate_piece_terms(board):
+    """
+    The terms of evaluate_board that depend on more than piece placement tables and pawn
+    structure, but not on the move history: tactics, rook activity, early queen use, king
+    safety and development.
+    """
+    value = tactics.evaluate_tactics(board)
     value += evaluate_rook_activity(board)
 
-    # Penalize repeated positions (discourages shuffling)
-    if board.is_repetition():
-        value -= 50 if board.turn == chess.BLACK else 50  # Penalty for repetition
-
     # Penalize early queen moves
     if chess.WHITE:
         value -= penalize_early_queen_use(board)
@@ -470,18 +667,20 @@ def evaluate_board(board):
     value -= evaluate_king_safety(board, chess.BLACK)
     value -= check_development_penalty(board, chess.BLACK)
     value -= check_development_penalty(board, chess.WHITE)
-    for square in black_pieces:
-        value -= is_piece_defended(board, square, chess.BLACK)
-        value += is_piece_defended(board, square, chess.BLACK)
-    if chess.WHITE:
-        value += penalize_multiple_piece_moves(board)
-    if chess.BLACK:
-        value -= penalize_multiple_piece_moves(board)
-
-    if is_endgame_phase:
-        value += evaluate_pawn_advancement(board, chess.WHITE)
-        value -= evaluate_pawn_advancement(board, chess.BLACK)
+    return value
 
+def evaluate_history_terms(board, context=None):
+    """
+    The terms of evaluate_board that depend on the moves played: repetition and repeated
+    piece moves. They are never cached. With a SearchContext in sync with the board they
+    are read from it instead of replaying the game.
+    """
+    value = 0
+    # Penalize repeated positions (discourages shuffling)
+    repetition = context.is_repetition() if context is not None else board.is_repetition()
+    if repetition:
+        value -= 50 if board.turn == chess.BLACK else 50  # Penalty for repetition
+    value -= penalize_multiple_piece_moves(board, context)
     return value
 
 
@@ -495,13 +694,15 @@ def find_best_move_with_mate_in_one_prevention(board):
     """
     best_move = None
     best_value = -float('inf') if board.turn == chess.WHITE else float('inf')
+    # Moves after which the opponent has a mate in one
+    refutations = RootMoves(board).refutations
 
     # Iterate over all legal moves
     for move in board.legal_moves:
         board.push(move)
 
         # Check if the opponent has a mate-in-one after this move
-        if not is_mate_in_one(board, not board.turn):  # Opponent's turn after the move
+        if move not in refutations:
             # Evaluate the resulting board position
             eval_value = evaluate_board(board)
 
@@ -521,67 +722,505 @@ def detect_mate_in_one(board):
     """
     Check if there's a mate in one move and return the move if found.
     """
-    for move in board.legal_moves:
+    return transposition.decode_move(position.from_board(board).mate_in_one())
+
+class SearchTimeout(Exception):
+    """
+    Raised inside negamax when the hard deadline of the running search has passed.
+    """
+
+def check_deadline():
+    """
+    Counts a searched node and raises SearchTimeout once the hard deadline has passed or the
+    search was stopped from outside. Both are only checked every TIME_CHECK_INTERVAL nodes.
+    """
+    stats.nodes += 1
+    if stats.nodes % TIME_CHECK_INTERVAL == 0:
+        if _hard_deadline is not None and time.time() >= _hard_deadline:
+            raise SearchTimeout()
+        if _stop is not None and _stop():
+            raise SearchTimeout()
+
+def make_move(board, move):
+    """
+    Pushes a move during the search, keeping the incremental evaluator and the search context
+    of the search in sync.
+    """
+    if _context is not None:
+        _context.push(move)
+    if _evaluator is not None:
+        _evaluator.push(board, move)
+    else:
         board.push(move)
-        if board.is_checkmate():
-            board.pop()
-            return move  # Return the move that causes checkmate
-        board.pop()
-    return None
 
-def minimax(board, depth, alpha, beta, maximizing_player, last_move=None):
+def unmake_move(board):
+    """
+    Pops the last move made with make_move.
+    """
+    if _context is not None:
+        _context.pop()
+    if _evaluator is not None:
+        return _evaluator.pop(board)
+    return board.pop()
+
+def record_cutoff(board, move, index, ply, depth):
     """
-    Minimax algorithm with alpha-beta pruning using bitboards.
+    Updates the cutoff statistics and the killer/history tables after a beta cutoff.
+    index is the position of the move in the searched move order.
+    """
+    stats.cutoffs += 1
+    if index == 0:
+        stats.first_move_cutoffs += 1
+    move_orderer.record_cutoff(board, move, ply, depth)
+
+def evaluate_relative(board, key=None):
+    """
+    Static evaluation from the point of view of the side to move, as negamax expects.
+    """
+    value = evaluate_board(board, _evaluator, key, _context)
+    return value if board.turn == chess.WHITE else -value
+
+def quiescence(board, alpha, beta, node_limit=None):
     """
-    if depth == 0 or board.is_game_over():
-        return evaluate_board(board), None
+    Resolves captures and promotions at the leaves of the search so the static evaluation is not
+    taken in the middle of an exchange. The side to move may stand pat on the static evaluation,
+    and captures that lose material according to static exchange evaluation are skipped.
+    Scores are from the point of view of the side to move.
 
+    Every call from the main search may visit QUIESCENCE_NODE_LIMIT nodes; node_limit is the
+    node count at which the current one stops, set by the outermost call.
+    """
+    if node_limit is None:
+        node_limit = stats.quiescence_nodes + QUIESCENCE_NODE_LIMIT
+    stats.quiescence_nodes += 1
+    if _hard_deadline is not None and stats.quiescence_nodes % TIME_CHECK_INTERVAL == 0:
+        if time.time() >= _hard_deadline:
+            raise SearchTimeout()
+
+    stand_pat = evaluate_relative(board)
+    if stats.quiescence_nodes >= node_limit:
+        return stand_pat
+
+    if stand_pat >= beta:
+        return stand_pat
+    alpha = max(alpha, stand_pat)
+
+    best_eval = stand_pat
+    for move in tactical_moves(board):
+        if tactics.static_exchange_evaluation(board, move) < 0:
+            continue  # Losing capture
+
+        make_move(board, move)
+        eval = -quiescence(board, -beta, -alpha, node_limit)
+        unmake_move(board)
+
+        if eval > best_eval:
+            best_eval = eval
+        alpha = max(alpha, eval)
+        if alpha >= beta:
+            break
+    return best_eval
+
+def tactical_moves(board):
+    """
+    Returns the legal captures and promotions, most valuable victim first.
+    """
+    moves = list(board.generate_legal_captures())
+    promotion_squares = chess.BB_BACKRANKS & ~board.occupied
+    moves.extend(board.generate_legal_moves(from_mask=board.pawns, to_mask=promotion_squares))
+    moves.sort(key=lambda move: move_ordering.mvv_lva(board, move), reverse=True)
+    return moves
+
+def has_non_pawn_material(board, color):
+    """
+    Returns True if color has any piece besides pawns and the king.
+    """
+    return bool(board.occupied_co[color] & ~(board.pawns | board.kings))
+
+def null_move_allowed(board, depth, ply):
+    """
+    Null-move pruning is skipped at the root, near the leaves, in check and in pawn-only
+    endgames for the side to move, where passing can be the best move (zugzwang).
+    """
+    if not USE_NULL_MOVE_PRUNING or ply == 0 or depth < NULL_MOVE_MIN_DEPTH or board.is_check():
+        return False
+    return not (is_endgame(board) and not has_non_pawn_material(board, board.turn))
+
+def is_quiet(board, move):
+    return not move.promotion and not board.is_capture(move)
+
+def negamax(board, depth, alpha, beta, last_move=None, ply=0, allow_null=True):
+    """
+    Principal variation search (negascout) with alpha-beta pruning using bitboards. Scores are
+    from the point of view of the side to move.
+
+    The first move of a node is searched with the full window; later moves get a zero window
+    around alpha and are only re-searched with the full window when they fail high.
+    Results are stored in the transposition table, which is probed for cutoffs. Moves are searched
+    in the order given by move_orderer: hash move, captures, killers, then history.
+
+    Selective pruning, each switchable on its own:
+    - null-move pruning: if passing still fails high at reduced depth, the node is cut off;
+    - late move reductions: quiet moves late in the move order are first searched one ply
+      shallower and only searched at full depth if they beat alpha;
+    - futility pruning: near the leaves, quiet moves are skipped when the static evaluation
+      is too far below alpha to catch up.
+    """
+    if depth == 0:
+        # Leaves are counted as quiescence nodes; a finished game has no captures to resolve
+        return quiescence(board, alpha, beta), None
+    check_deadline()
+    if board.is_game_over():
+        return evaluate_relative(board), None
+
+    key = _context.key() if _context is not None else transposition.board_hash(board)
+    alpha_orig = alpha
+    hash_move = None
+    entry = transposition_table.probe(key)
+    if entry is not None:
+        _, entry_depth, entry_score, entry_bound, hash_move, _ = entry
+        if entry_depth >= depth and hash_move is not None:
+            if entry_bound == transposition.EXACT:
+                return entry_score, hash_move
+            if entry_bound == transposition.LOWER_BOUND:
+                alpha = max(alpha, entry_score)
+            elif entry_bound == transposition.UPPER_BOUND:
+                beta = min(beta, entry_score)
+            if alpha >= beta:
+                return entry_score, hash_move
+    if hash_move is None:
+        # Fall back to the principal variation of the previous iteration
+        hash_move = _pv_moves.get(key)
+
+    if allow_null and null_move_allowed(board, depth, ply):
+        make_move(board, chess.Move.null())
+        eval, _ = negamax(board, depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, ply=ply + 1, allow_null=False)
+        eval = -eval
+        unmake_move(board)
+        if eval >= beta:
+            stats.null_move_cutoffs += 1
+            return eval, None
+
+    in_check = board.is_check()
+    futility_value = None
+    if USE_FUTILITY_PRUNING and ply > 0 and depth in FUTILITY_MARGINS and not in_check:
+        static_eval = evaluate_relative(board, key)
+        if static_eval + FUTILITY_MARGINS[depth] <= alpha:
+            futility_value = static_eval + FUTILITY_MARGINS[depth]
+
+    killers = move_orderer.killers[ply] if ply < move_ordering.MAX_PLY else ()
+    moves = move_orderer.order(board, board.legal_moves, ply, hash_move)
+    if ply == 0 and _root_moves is not None:
+        moves = _root_moves.order(moves)
     best_move = None
+    best_eval = -float('inf')
+
+    for index, move in enumerate(moves):
+        quiet = is_quiet(board, move)
+        make_move(board, move)
+        gives_check = board.is_check()
+
+        # Skip quiet moves that cannot raise the score to alpha
+        if futility_value is not None and quiet and not gives_check and index > 0:
+            unmake_move(board)
+            stats.futility_prunes += 1
+            best_eval = max(best_eval, futility_value)
+            continue
+
+        # Detect and penalize shuffling (moving a piece back and forth between two squares)
+        if last_move and move.from_square == last_move.to_square and move.to_square == last_move.from_square:
+            eval = -1000  # Heavy penalty for shuffling
+        elif index == 0:
+            eval, _ = negamax(board, depth - 1, -beta, -alpha, last_move=move, ply=ply + 1)
+            eval = -eval
+        else:
+            new_depth = depth - 1
+            if (USE_LATE_MOVE_REDUCTIONS and depth >= LMR_MIN_DEPTH and index >= LMR_FULL_DEPTH_MOVES
+                    and quiet and not in_check and not gives_check and move not in killers):
+                stats.reductions += 1
+                new_depth -= 1
+
+            # Zero window search: only prove the move is no better than alpha
+            eval, _ = negamax(board, new_depth, -alpha - 1, -alpha, last_move=move, ply=ply + 1)
+            eval = -eval
+            if eval > alpha and new_depth < depth - 1:
+                stats.re_searches += 1
+                eval, _ = negamax(board, depth - 1, -alpha - 1, -alpha, last_move=move, ply=ply + 1)
+                eval = -eval
+            if alpha < eval < beta:
+                stats.pv_re_searches += 1
+                eval, _ = negamax(board, depth - 1, -beta, -alpha, last_move=move, ply=ply + 1)
+                eval = -eval
+
+        unmake_move(board)
+        if eval > best_eval:
+            best_eval = eval
+            best_move = move
+
+        alpha = max(alpha, eval)
+        if alpha >= beta:
+            record_cutoff(board, move, index, ply, depth)
+            break
+
+    if best_eval <= alpha_orig:
+        bound = transposition.UPPER_BOUND
+    elif best_eval >= beta:
+        bound = transposition.LOWER_BOUND
+    else:
+        bound = transposition.EXACT
+    transposition_table.store(key, depth, best_eval, bound, best_move)
 
+    return best_eval, best_move
+
+def minimax(board, depth, alpha, beta, maximizing_player, last_move=None):
+    """
+    Minimax interface to negamax: alpha, beta and the returned score are from White's point of
+    view. maximizing_player must be True when White is to move.
+    """
     if maximizing_player:
-        max_eval = -float('inf')
-        for move in board.legal_moves:
-            board.push(move)
+        return negamax(board, depth, alpha, beta, last_move=last_move)
+    score, move = negamax(board, depth, -beta, -alpha, last_move=last_move)
+    return -score, move
 
-            # Detect and penalize shuffling (moving a piece back and forth between two squares)
-            if last_move and move.from_square == last_move.to_square and move.to_square == last_move.from_square:
-                eval = -1000  # Heavy penalty for shuffling
-            else:
-                eval, _ = minimax(board, depth - 1, alpha, beta, False, last_move=move)
+def extract_pv(board, max_length):
+    """
+    Follows the best moves stored in the transposition table to rebuild the principal variation.
+    """
+    pv = []
+    seen = set()
+    for _ in range(max_length):
+        key = transposition.board_hash(board)
+        entry = transposition_table.probe(key)
+        if key in seen or entry is None or entry[4] is None or not board.is_legal(entry[4]):
+            break
+        seen.add(key)
+        pv.append(entry[4])
+        board.push(entry[4])
+    for _ in pv:
+        board.pop()
+    return pv
 
-            board.pop()
-            if eval > max_eval:
-                max_eval = eval
-                best_move = move
+def remember_pv(board, pv):
+    """
+    Records the principal variation so the next iteration searches it first.
+    """
+    _pv_moves.clear()
+    for move in pv:
+        _pv_moves[transposition.board_hash(board)] = move
+        board.push(move)
+    for _ in pv:
+        board.pop()
+
+def aspiration_search(board, depth, previous_score):
+    """
+    Searches the root with a narrow window around the previous iteration's score, widening it
+    on the failing side until the score falls inside. Scores are from the side to move's view.
+    """
+    if previous_score is None or depth < 2:
+        return negamax(board, depth, -float('inf'), float('inf'))
+
+    window = ASPIRATION_WINDOW
+    alpha = previous_score - window
+    beta = previous_score + window
+    while True:
+        score, move = negamax(board, depth, alpha, beta)
+        if score <= alpha:
+            stats.aspiration_fails += 1
+            window *= ASPIRATION_WIDENING
+            alpha = score - window if window < 64 * ASPIRATION_WINDOW else -float('inf')
+        elif score >= beta:
+            stats.aspiration_fails += 1
+            window *= ASPIRATION_WIDENING
+            beta = score + window if window < 64 * ASPIRATION_WINDOW else float('inf')
+        else:
+            return score, move
+
+def iterative_deepening(board, max_depth=MAX_SEARCH_DEPTH, soft_limit=None, hard_limit=None, start_time=None,
+                        start_depth=1, stop=None, report=None, root_moves=None):
+    """
+    Searches with negamax at increasing depths until max_depth or the time budget is reached.
+    From depth 2 on, each iteration starts with an aspiration window around the previous score.
+
+    Arguments:
+    board: chess.Board() object representing the current board state.
+    max_depth: Deepest iteration to search.
+    soft_limit: Seconds after which no new iteration is started.
+    hard_limit: Seconds after which the running iteration is aborted.
+    start_time: time.time() at which the budget started; defaults to now.
+    start_depth: First iteration to search.
+    stop: Optional callable; once it returns True the running iteration is aborted.
+    report: Optional callable, called as report(depth, score, pv) after every completed
+    iteration with the score from the side to move's point of view. If it returns True, no
+    further iteration is started.
+    root_moves: Optional RootMoves of board; its refuted moves are searched last and known
+    mates against them are seeded into the transposition table.
 
-            alpha = max(alpha, eval)
-            if beta <= alpha:
+    Returns:
+    tuple: (score, best_move, depth) from the last fully searched depth, the score from White's
+    point of view.
+    """
+    global _hard_deadline, _evaluator, _context, _stop, _root_moves
+    if start_time is None:
+        start_time = time.time()
+    perspective = 1 if board.turn == chess.WHITE else -1
+    root_ply = len(board.move_stack)
+
+    best = (None, None, 0)
+    previous_score = None
+    stats.reset()
+    _pv_moves.clear()
+    transposition_table.new_search()
+    move_orderer.new_search()
+    if root_moves is not None:
+        root_moves.seed(transposition_table)
+        _root_moves = root_moves
+    # Material and positional totals are computed once here and updated move by move below
+    _evaluator = IncrementalEvaluator(board)
+    # The game history is replayed once here; evaluations read it from the context
+    _context = search_context.SearchContext(board)
+    try:
+        for depth in range(start_depth, max_depth + 1):
+            # The first iteration always runs to completion so there is a move to play
+            if depth > start_depth:
+                if hard_limit is not None:
+                    _hard_deadline = start_time + hard_limit
+                _stop = stop
+            iteration_start = time.time()
+            nodes_before = stats.nodes
+            try:
+                score, move = aspiration_search(board, depth, previous_score)
+            except SearchTimeout:
+                while len(board.move_stack) > root_ply:
+                    unmake_move(board)
+                break
+            if move is None:
+                break
+            previous_score = score
+            best = (score * perspective, move, depth)
+            stats.finish_iteration(depth, nodes_before)
+
+            pv = extract_pv(board, depth)
+            if not pv or pv[0] != move:
+                pv = [move]
+            remember_pv(board, pv)
+            if report is not None and report(depth, score, pv):
                 break
-        return max_eval, best_move
-    else:
-        min_eval = float('inf')
-        for move in board.legal_moves:
-            board.push(move)
 
-            # Detect and penalize shuffling (moving a piece back and forth between two squares)
-            if last_move and move.from_square == last_move.to_square and move.to_square == last_move.from_square:
-                eval = 1000  # Heavy penalty for shuffling
-            else:
-                eval, _ = minimax(board, depth - 1, alpha, beta, True, last_move=move)
+            now = time.time()
+            if soft_limit is not None:
+                elapsed = now - start_time
+                # The next iteration takes several times longer than this one did
+                if elapsed >= soft_limit or elapsed + (now - iteration_start) * 2 > soft_limit:
+                    break
+    finally:
+        _hard_deadline = None
+        _evaluator = None
+        _context = None
+        _stop = None
+        _root_moves = None
+
+    return best
+
+def get_mate_pool():
+    """
+    Returns the engine's mate search pool, starting its worker processes on first use.
+    """
+    global _mate_pool
+    if _mate_pool is None:
+        _mate_pool = checkmate.MateSearchPool(MATE_SEARCH_PROCESSES)
+        atexit.register(shutdown_mate_pool)
+    return _mate_pool
 
-            board.pop()
-            if eval < min_eval:
-                min_eval = eval
-                best_move = move
+def shutdown_mate_pool():
+    """
+    Stops the mate search workers. The pool is restarted by the next get_mate_pool call.
+    """
+    global _mate_pool
+    if _mate_pool is not None:
+        _mate_pool.close()
+        _mate_pool = None
 
-            beta = min(beta, eval)
-            if beta <= alpha:
-                break
-        return min_eval, best_move
+def get_smp_search():
+    """
+    Returns the engine's Lazy SMP search, starting its worker processes on first use.
+    """
+    global _smp_search
+    if _smp_search is None:
+        _smp_search = smp.LazySMPSearch(SEARCH_PROCESSES, TT_SIZE_MB)
+        atexit.register(shutdown_smp_search)
+    return _smp_search
 
-def run_chess_bot(board, depth=4):
-    move_history = list(board.move_stack)
+def shutdown_smp_search():
+    """
+    Stops the Lazy SMP workers and frees their shared transposition table.
+    """
+    global _smp_search
+    if _smp_search is not None:
+        _smp_search.close()
+        _smp_search = None
+
+class RootMoves:
+    """
+    The legal moves of a root position, generated and classified once per move and shared by
+    the stages of run_chess_bot: the forced move check, the mate search and the main search.
+
+    mates holds the moves that checkmate and checks the other checking moves. refutations maps
+    every move after which the opponent has a mate in one to (Zobrist key of the position after
+    the move, mating reply).
+    """
 
+    def __init__(self, board):
+        compact = position.from_board(board)
+        self.moves = []
+        self.mates = []
+        self.checks = []
+        self.refutations = {}
+        for code in compact.generate_legal_moves():
+            move = transposition.decode_move(code)
+            self.moves.append(move)
+            undo = compact.make(code)
+            if compact.is_check() and not compact.has_legal_move():
+                self.mates.append(move)
+            else:
+                if compact.is_check():
+                    self.checks.append(move)
+                reply = compact.mate_in_one()
+                if reply is not None:
+                    self.refutations[move] = (compact.zobrist, transposition.decode_move(reply))
+            compact.unmake(code, undo)
+
+    def mate_candidates(self):
+        """
+        Root moves worth a forced mate search, checks first. A move that allows a mate in one
+        cannot start a forced mate and is left out.
+        """
+        checks = [move for move in self.checks if move not in self.refutations]
+        quiet = [move for move in self.moves if move not in self.refutations and move not in self.checks]
+        return checks + quiet
+
+    def order(self, moves):
+        """
+        Moves the refuted moves to the end of an ordered move list.
+        """
+        if not self.refutations:
+            return moves
+        return ([move for move in moves if move not in self.refutations] +
+                [move for move in moves if move in self.refutations])
+
+    def seed(self, table):
+        """
+        Stores the positions after refuted moves in table as exact mates for the opponent, so
+        the search rejects those moves without searching them.
+        """
+        for key, reply in self.refutations.values():
+            table.store(key, MAX_SEARCH_DEPTH, MATE_SCORE, transposition.EXACT, reply)
+
+def find_forced_move(board, soft_limit=None, root_moves=None):
+    """
+    Looks for a move that needs no search: a book move, the only legal move, a mate in one, or
+    a short forced mate found within a share of the soft time limit. Returns None when the
+    position must be searched.
+    """
     # Use opening book if the current move sequence matches any sequence in the book
     opening_move = openings.find_move_in_book(board)
 
@@ -591,40 +1230,64 @@ def run_chess_bot(board, depth=4):
         # Convert the UCI string move from the opening book to a chess.Move object
         return opening_move
 
-	
+    if root_moves is None:
+        root_moves = RootMoves(board)
+    if len(root_moves.moves) == 1:
+        return root_moves.moves[0]
     # Check for mate in one
-    mate = detect_mate_in_one(board)
-    if mate is not None:
-        return mate
+    if root_moves.mates:
+        return root_moves.mates[0]
 
+    candidates = root_moves.mate_candidates()
+    if not candidates:
+        return None  # Every move allows a mate in one
     bfen = board.fen()
-    time_limit = 5
-    mate_in, best_move = checkmate.detect_mate(bfen, max_depth=5, time_limit=time_limit)
+    time_limit = MATE_SEARCH_TIME
+    if soft_limit is not None:
+        time_limit = min(time_limit, soft_limit * MATE_SEARCH_SHARE)
+    if MATE_SEARCH_BACKEND == "pns":
+        mate_in, best_move = checkmate.detect_mate(bfen, max_depth=MATE_SEARCH_DEPTH, time_limit=time_limit, backend="pns")
+    else:
+        mate_in, best_move = checkmate.detect_mate(bfen, max_depth=MATE_SEARCH_DEPTH, time_limit=time_limit,
+                                                   pool=get_mate_pool(), moves=candidates)
     if mate_in is not None:
         print("mate found")
         return best_move
+    return None
 
-    bot_color = chess.WHITE if board.turn == chess.WHITE else chess.BLACK
-        # Check for mate
-    time_limit = 5.0
-    mate_three = detect_mate_in_three(board, bot_color, time_limit)
-    print(mate_three)
-    if mate_three:
-        print("Mate in n!")
-        return mate_three
-
-    # Count the number of legal moves directly
-    legal_moves_count = len(list(board.legal_moves))
-
-    # Set depth based on the number of legal moves
-    if legal_moves_count == 1:
-        depth = 1
-    elif legal_moves_count < 11:
-        depth = 4
+def run_chess_bot(board, depth=4, time_left=None, increment=0.0, movetime=None, moves_to_go=None):
+    """
+    Picks a move for the side to move.
+
+    Without clock information the search deepens to a depth chosen from the number of legal
+    moves. With time_left/increment (or movetime), in seconds, iterative deepening runs until
+    the share of the clock allocated to this move is used up.
+
+    The root moves are generated and classified once (RootMoves) and shared by all stages,
+    which draw on one time budget counted from the start of the call: the mate search gets
+    MATE_SEARCH_SHARE of it and the main search the remainder.
+    """
+    start_time = time.time()
+    soft_limit, hard_limit = timeman.allocate_time(time_left, increment, movetime, moves_to_go)
+    root_moves = RootMoves(board)
+
+    forced_move = find_forced_move(board, soft_limit, root_moves)
+    if forced_move is not None:
+        return forced_move
+
+    if soft_limit is None:
+        # Set depth based on the number of legal moves
+        if len(root_moves.moves) < 11:
+            depth = 4
+        else:
+            depth = 3
     else:
-        depth = 3
+        depth = MAX_SEARCH_DEPTH
 
-    # Proceed with minimax for the best move
+    # Proceed with iterative deepening minimax for the best move
     print("minimax")
-    _, best_move = minimax(board, depth, -float('inf'), float('inf'), board.turn == chess.WHITE)
+    if SEARCH_PROCESSES > 1:
+        _, best_move, _ = get_smp_search().search(board, depth, soft_limit, hard_limit, start_time, root_moves)
+    else:
+        _, best_move, _ = iterative_deepening(board, depth, soft_limit, hard_limit, start_time, root_moves=root_moves)
     return best_move
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+
+DEFAULT_ENTRIES = 1 << 16
+
+class EvaluationCache:
+    """
+    Bounded cache of static evaluations with least recently used eviction.
+
+    Keys are built by the caller from the Zobrist hash and whatever else the cached value
+    depends on (see engine.evaluate_board); values are the evaluations. Once the cache holds its maximum number of entries, storing a new position
+    evicts the one that was looked up or stored longest ago.
+    """
+
+    def __init__(self, entries=DEFAULT_ENTRIES):
+        self.size = max(1, entries)
+        self.clear()
+
+    def clear(self):
+        self._entries = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def resize(self, entries):
+        """
+        Changes the maximum number of entries, evicting the oldest ones if it shrinks.
+        """
+        self.size = max(1, entries)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def probe(self, key):
+        """
+        Returns the cached evaluation for key, or None on a miss.
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def store(self, key, value):
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+import chess
+import server
+
+DEFAULT_GAMES = 8
+DEFAULT_PLIES = 40  # Plies per simulated game, both sides together
+DEFAULT_GAME_TIME = 60.0
+
+async def request(reader, writer, message):
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+async def play_game(host, port, game_id, plies, game_time, increment, rng, latencies):
+    """
+    Plays one game against the server: the engine has White, the simulated user answers with
+    random legal moves. Returns the number of engine moves received.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    engine_moves = 0
+    try:
+        await request(reader, writer, {"type": "new", "game": game_id, "time": game_time, "increment": increment})
+        board = chess.Board()
+        while not board.is_game_over() and len(board.move_stack) < plies:
+            if board.turn == chess.WHITE:
+                start = time.perf_counter()
+                reply = await request(reader, writer, {"type": "move", "game": game_id,
+                                                       "moves": [move.uci() for move in board.move_stack]})
+                if reply["type"] != "move" or reply["move"] is None:
+                    print(f"game {game_id}: {reply.get('message', 'no move')}")
+                    break
+                latencies.append(time.perf_counter() - start)
+                board.push_uci(reply["move"])
+                engine_moves += 1
+            else:
+                await asyncio.sleep(rng.uniform(0.0, 0.2))  # The user thinks
+                board.push(rng.choice(list(board.legal_moves)))
+        await request(reader, writer, {"type": "end", "game": game_id})
+    finally:
+        writer.close()
+    return engine_moves
+
+async def run(host, port, games, plies, game_time, increment, seed):
+    """
+    Simulates games concurrent games and prints client-side latency percentiles, throughput and
+    the server's own metrics.
+    """
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    moves = await asyncio.gather(*[play_game(host, port, f"load-{index}", plies, game_time, increment,
+                                             random.Random(rng.random()), latencies)
+                                   for index in range(games)])
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        metrics = await request(reader, writer, {"type": "metrics"})
+    finally:
+        writer.close()
+
+    p50 = server.percentile(latencies, 0.5)
+    p99 = server.percentile(latencies, 0.99)
+    print(f"{games} games  {sum(moves)} engine moves in {elapsed:.1f} s  {sum(moves) / elapsed:.2f} moves/s")
+    if latencies:
+        print(f"client latency  p50 {p50:.3f} s  p99 {p99:.3f} s")
+    print("server metrics  " + json.dumps({name: value for name, value in metrics.items() if name not in ("id", "game", "type")}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for server.py: simulates concurrent games")
+    parser.add_argument("--host", default=server.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=server.DEFAULT_PORT)
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="Concurrent games")
+    parser.add_argument("--plies", type=int, default=DEFAULT_PLIES, help="Plies per game")
+    parser.add_argument("--time", type=float, default=DEFAULT_GAME_TIME, help="Engine clock per game in seconds")
+    parser.add_argument("--increment", type=float, default=0.0, help="Increment per move in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.games, args.plies, args.time, args.increment, args.seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import chess
+
+MAX_PLY = 128
+KILLERS_PER_PLY = 2
+HISTORY_LIMIT = 1 << 20  # History scores are halved once one of them passes this value
+
+# Sort keys of the move classes; within a class a higher score is searched earlier
+HASH_MOVE_SCORE = 1 << 40
+CAPTURE_SCORE = 1 << 32
+KILLER_SCORE = 1 << 30
+
+# Victim and attacker ranks for MVV-LVA ordering
+MVV_LVA_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9,
+    chess.KING: 100,
+}
+
+def mvv_lva(board, move):
+    """
+    Most valuable victim, least valuable attacker score of a capture or promotion.
+    """
+    if board.is_en_passant(move):
+        victim = MVV_LVA_VALUES[chess.PAWN]
+    else:
+        victim_type = board.piece_type_at(move.to_square)
+        victim = MVV_LVA_VALUES[victim_type] if victim_type else 0
+    if move.promotion:
+        victim += MVV_LVA_VALUES[move.promotion]
+    return victim * 128 - MVV_LVA_VALUES[board.piece_type_at(move.from_square)]
+
+class MoveOrderer:
+    """
+    Orders moves for alpha-beta: the hash/PV move first, then captures and promotions ranked
+    by MVV-LVA, then the killer moves of the ply, then quiet moves by their history score.
+
+    Killers are quiet moves that caused a beta cutoff at the same ply in a sibling subtree;
+    the history table accumulates depth * depth for every quiet cutoff move, per side to move.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.killers = [[None] * KILLERS_PER_PLY for _ in range(MAX_PLY)]
+        self.history = [[0] * 4096, [0] * 4096]
+
+    def new_search(self):
+        """
+        Forgets the killers of the previous search and fades its history scores.
+        """
+        self.killers = [[None] * KILLERS_PER_PLY for _ in range(MAX_PLY)]
+        for table in self.history:
+            for index in range(4096):
+                table[index] >>= 1
+
+    def order(self, board, moves, ply, hash_move=None):
+        """
+        Returns the moves sorted into search order.
+        """
+        killers = self.killers[ply] if ply < MAX_PLY else ()
+        history = self.history[board.turn]
+        scored = []
+        for move in moves:
+            if move == hash_move:
+                score = HASH_MOVE_SCORE
+            elif move.promotion or board.is_capture(move):
+                score = CAPTURE_SCORE + mvv_lva(board, move)
+            elif move in killers:
+                score = KILLER_SCORE - killers.index(move)
+            else:
+                score = history[move.from_square * 64 + move.to_square]
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def record_cutoff(self, board, move, ply, depth):
+        """
+        Updates the killers and history for a move that caused a beta cutoff.
+        Must be called with the move not yet made on the board.
+        """
+        if move.promotion or board.is_capture(move):
+            return
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers.pop()
+                killers.insert(0, move)
+
+        history = self.history[board.turn]
+        index = move.from_square * 64 + move.to_square
+        history[index] += depth * depth
+        if history[index] > HISTORY_LIMIT:
+            for table in self.history:
+                for i in range(4096):
+                    table[i] >>= 1
@@ -1,49 +1,205 @@
 import random
+import struct
 import chess
+import chess.polyglot
+from multiprocessing import shared_memory
 
-def find_move_in_book(board, book_file="Book.txt"):
-    fen_input = board.fen().strip()  # Ensure FEN is stripped of any surrounding whitespace
-    pos = fen_input.find("-")
-    fen_input = fen_input[:pos].strip()
-    print(fen_input)
-    try:
-        with open(book_file, 'r') as file:
-            lines = file.readlines()
+ZOBRIST = chess.polyglot.POLYGLOT_RANDOM_ARRAY
 
-        fen_found = False
-        moves = []
+# Parsed books, keyed by book file: {position hash: (moves, weights)}
+_books = {}
 
-        for line in lines:
-            line = line.strip()
-
-            if line.startswith('pos'):  # Line defines a new FEN position
-                current_fen = line.split('pos ', 1)[1].strip()  # Handle splitting safely
-                pos = current_fen.find("-")
-                current_fen = current_fen[:pos].strip()
-                if current_fen == fen_input:
-                    fen_found = True
-                    moves = []  # Reset moves for the matching position
-                else:
-                    fen_found = False  # No match, continue looking
-
-            elif fen_found:  # Collect moves if we found the correct FEN
-                if not line:  # Break if the line is empty
-                    break
-                move_data = line.split()
-                if move_data:
-                    moves.append(move_data[0])  # Add move (first element) only if it's valid
-
-        if moves:
-            move = random.choice(moves)  # Randomly select a move from the available ones
-            print(move)
-            return move
+# Shared memory layout: a header, an open-addressing table of positions, then the move records
+_HEADER = struct.Struct("<QQ")  # slot count, move count
+_SLOT = struct.Struct("<QII")  # position hash (0 = empty), first move record, number of moves
+_MOVE = struct.Struct("<6sI")  # UCI move padded with spaces, weight
+
+# FEN piece letter -> polyglot piece index (black before white for each piece type)
+_PIECE_INDEX = {symbol: (chess.PIECE_SYMBOLS.index(symbol.lower()) - 1) * 2 + symbol.isupper() for symbol in "pnbrqkPNBRQK"}
+
+# Castling letter -> (polyglot key index, king, king square, rook, rook square)
+_CASTLING_KEYS = {
+    "K": (768, "K", chess.E1, "R", chess.H1),
+    "Q": (769, "K", chess.E1, "R", chess.A1),
+    "k": (770, "k", chess.E8, "r", chess.H8),
+    "q": (771, "k", chess.E8, "r", chess.A8),
+}
+
+def position_key(board):
+    """
+    Returns the hash used to index book positions (the polyglot Zobrist hash).
+    """
+    return chess.polyglot.zobrist_hash(board)
+
+def _fen_key(placement, turn, castling, ep):
+    """
+    Computes the polyglot Zobrist hash of a FEN position without building a chess.Board.
+    """
+    key = 0
+    pieces = {}
+    rank = 7
+    file = 0
+    for char in placement:
+        if char == "/":
+            rank -= 1
+            file = 0
+        elif char.isdigit():
+            file += int(char)
         else:
-            print("None")
-            return None  # No moves found for the position
+            square = rank * 8 + file
+            pieces[square] = char
+            key ^= ZOBRIST[64 * _PIECE_INDEX[char] + square]
+            file += 1
+
+    for char in castling:
+        if char in _CASTLING_KEYS:
+            index, king, king_square, rook, rook_square = _CASTLING_KEYS[char]
+            # Ignore rights that chess.Board would drop because the king or rook has moved
+            if pieces.get(king_square) == king and pieces.get(rook_square) == rook:
+                key ^= ZOBRIST[index]
+
+    white_to_move = turn == "w"
+    if ep != "-":
+        # Only hash the en passant file if a pawn is ready to capture
+        ep_square = chess.parse_square(ep)
+        capture_rank = chess.square_rank(ep_square) + (-1 if white_to_move else 1)
+        ep_file = chess.square_file(ep_square)
+        for capture_file in (ep_file - 1, ep_file + 1):
+            if 0 <= capture_file <= 7:
+                if pieces.get(chess.square(capture_file, capture_rank)) == ("P" if white_to_move else "p"):
+                    key ^= ZOBRIST[772 + ep_file]
+                    break
+
+    if white_to_move:
+        key ^= ZOBRIST[780]
+    return key
+
+def parse_book(book_file="Book.txt"):
+    """
+    Parses a book file into {position hash: (moves, weights)}.
+
+    The file lists positions as "pos <fen>" lines, each followed by "<uci move> <weight>" lines.
+    """
+    index = {}
+    moves = weights = None
+    with open(book_file, 'r') as file:
+        for line in file:
+            fields = line.split()
+            if not fields:
+                moves = weights = None
+            elif fields[0] == "pos":
+                placement, turn, castling = fields[1:4]
+                ep = fields[4] if len(fields) > 4 else "-"
+                moves, weights = index.setdefault(_fen_key(placement, turn, castling, ep), ([], []))
+            elif moves is not None:
+                moves.append(fields[0])
+                weights.append(int(fields[1]) if len(fields) > 1 else 1)
+    return index
+
+def load_book(book_file="Book.txt"):
+    """
+    Returns the parsed book, reading the file only on the first call in this process.
+    """
+    book = _books.get(book_file)
+    if book is None:
+        book = parse_book(book_file)
+        _books[book_file] = book
+    return book
 
+class SharedBook:
+    """
+    Read-only view of a book index that lives in shared memory, so worker processes can use
+    the index built by their parent instead of parsing the file themselves.
+    """
+
+    def __init__(self, name):
+        self.memory = shared_memory.SharedMemory(name=name)
+        self.slot_count, self.move_count = _HEADER.unpack_from(self.memory.buf, 0)
+        self._mask = self.slot_count - 1
+        self._moves_offset = _HEADER.size + self.slot_count * _SLOT.size
+
+    def get(self, key, default=None):
+        buf = self.memory.buf
+        slot = key & self._mask
+        while True:
+            slot_key, first, count = _SLOT.unpack_from(buf, _HEADER.size + slot * _SLOT.size)
+            if slot_key == 0:
+                return default
+            if slot_key == key:
+                break
+            slot = (slot + 1) & self._mask
+
+        moves = []
+        weights = []
+        for record in range(first, first + count):
+            move, weight = _MOVE.unpack_from(buf, self._moves_offset + record * _MOVE.size)
+            moves.append(move.decode().strip())
+            weights.append(weight)
+        return moves, weights
+
+    def close(self):
+        self.memory.close()
+
+def share_book(book_file="Book.txt"):
+    """
+    Packs the parsed book into a new shared memory block.
+
+    Worker processes pass memory.name to attach_shared_book. The caller owns the block and must
+    call close() and unlink() on it once the workers are done.
+    """
+    book = load_book(book_file)
+    slot_count = 1
+    while slot_count < len(book) * 2:
+        slot_count <<= 1
+    move_count = sum(len(moves) for moves, _ in book.values())
+
+    size = _HEADER.size + slot_count * _SLOT.size + move_count * _MOVE.size
+    memory = shared_memory.SharedMemory(create=True, size=size)
+    buf = memory.buf
+    buf[:size] = bytes(size)
+    _HEADER.pack_into(buf, 0, slot_count, move_count)
+
+    mask = slot_count - 1
+    moves_offset = _HEADER.size + slot_count * _SLOT.size
+    record = 0
+    for key, (moves, weights) in book.items():
+        slot = key & mask
+        while _SLOT.unpack_from(buf, _HEADER.size + slot * _SLOT.size)[0] != 0:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(buf, _HEADER.size + slot * _SLOT.size, key, record, len(moves))
+        for move, weight in zip(moves, weights):
+            _MOVE.pack_into(buf, moves_offset + record * _MOVE.size, move.ljust(6).encode(), weight)
+            record += 1
+    return memory
+
+def attach_shared_book(name, book_file="Book.txt"):
+    """
+    Makes lookups for book_file in this process use the shared block created by share_book.
+    """
+    _books[book_file] = SharedBook(name)
+
+def find_move_in_book(board, book_file="Book.txt", weighted=True):
+    """
+    Returns a UCI book move for the position, or None if the position is not in the book.
+    With weighted=True moves are picked in proportion to the weights listed in the book.
+    """
+    try:
+        entry = load_book(book_file).get(position_key(board))
     except FileNotFoundError:
         print(f"The file '{book_file}' was not found.")
         return None
     except Exception as e:
         print(f"An error occurred: {e}")
         return None
+
+    if not entry:
+        print("None")
+        return None  # No moves found for the position
+
+    moves, weights = entry
+    if weighted:
+        move = random.choices(moves, weights=weights)[0]
+    else:
+        move = random.choice(moves)  # Randomly select a move from the available ones
+    print(move)
+    return move
@@ -0,0 +1,59 @@
+import transposition
+
+DEFAULT_ENTRIES = 1 << 14
+
+class PawnHashTable:
+    """
+    Fixed-size cache of pawn structure evaluations keyed by the two pawn bitboards and the
+    endgame flag. Pawn structures change far less often than positions during a search, so
+    most lookups hit.
+
+    Entries are tuples starting with (white_pawns, black_pawns, is_endgame) followed by the
+    cached values; a colliding structure simply replaces the slot.
+    """
+
+    def __init__(self, entries=DEFAULT_ENTRIES):
+        self.size = transposition.table_size(entries)
+        self._mask = self.size - 1
+        self.clear()
+
+    def clear(self):
+        self._slots = [None] * self.size
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _index(self, white_pawns, black_pawns, is_endgame):
+        return hash((white_pawns, black_pawns, is_endgame)) & self._mask
+
+    def probe(self, white_pawns, black_pawns, is_endgame):
+        """
+        Returns the entry for the pawn structure, or None on a miss.
+        """
+        entry = self._slots[self._index(white_pawns, black_pawns, is_endgame)]
+        if entry is not None and entry[0] == white_pawns and entry[1] == black_pawns and entry[2] == is_endgame:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, entry):
+        """
+        Stores an entry whose first three items are the key.
+        """
+        index = self._index(entry[0], entry[1], entry[2])
+        if self._slots[index] is not None:
+            self.evictions += 1
+        self._slots[index] = entry
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
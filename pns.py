@@ -0,0 +1,177 @@
+import time
+import chess
+import chess.polyglot
+
+INFINITY = 10 ** 9
+DEFAULT_NODE_LIMIT = 200000
+TIME_CHECK_INTERVAL = 256  # Expanded nodes between two clock checks
+
+class ProofNumberSearch:
+    """
+    Depth-first proof-number search (df-pn) for a forced mate by the side to move.
+
+    Every node keeps a (phi, delta) pair from the point of view of the side to move there: phi
+    is the proof number of "the mover wins", delta its disproof number. The search expands the
+    most proving child until the node's thresholds are exceeded, so narrow forcing lines are
+    followed deep while wide defensive trees are postponed. Results are kept in a
+    transposition table keyed by the position and the plies left, which bounds the search.
+
+    The table stores [phi, delta, mate distance in plies, best move] per node.
+    """
+
+    def __init__(self, max_plies=9, node_limit=DEFAULT_NODE_LIMIT, time_limit=None):
+        self.max_plies = max_plies
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.table = {}
+        self.nodes = 0
+        self._deadline = None
+        self._stopped = False
+
+    def solve(self, board):
+        """
+        Searches the board for a forced mate by the side to move within max_plies, raising the
+        ply bound two plies at a time so the mate found is a shortest one.
+
+        Returns:
+        tuple: (mate_in, move) where mate_in counts the plies after move until mate, the same
+        scale as the root move results of checkmate.MateSearchPool, or (None, None) if no mate
+        was proven within the node and time budget.
+        """
+        self.attacker = board.turn
+        self.nodes = 0
+        self._stopped = False
+        self._deadline = time.time() + self.time_limit if self.time_limit else None
+
+        # Mates land on odd plies; deepening the ply bound makes the first proof a shortest mate
+        root_hash = chess.polyglot.zobrist_hash(board)
+        for plies in range(1, self.max_plies + 1, 2):
+            root_key = (root_hash, plies)
+            self._mid(board, root_key, INFINITY - 1, INFINITY - 1, plies)
+
+            phi, _, distance, move = self.table[root_key]
+            if phi == 0 and move is not None:
+                return distance - 1, move
+            if self._stopped:
+                break
+        return None, None
+
+    def _out_of_budget(self):
+        if self._stopped:
+            return True
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            self._stopped = True
+        elif self._deadline is not None and self.nodes % TIME_CHECK_INTERVAL == 0 and time.time() >= self._deadline:
+            self._stopped = True
+        return self._stopped
+
+    def _attacker_fails(self, board, key):
+        """
+        Stores a node where the attacker can no longer mate (draw or out of plies).
+        """
+        if board.turn == self.attacker:
+            entry = [INFINITY, 0, None, None]
+        else:
+            entry = [0, INFINITY, None, None]
+        self.table[key] = entry
+        return entry
+
+    def _mid(self, board, key, phi_threshold, delta_threshold, plies):
+        """
+        Multiple iterative deepening step of df-pn: searches the node until its phi or delta
+        reaches the given threshold.
+        """
+        self.nodes += 1
+        entry = self.table.get(key)
+        if entry is not None and (entry[0] >= phi_threshold or entry[1] >= delta_threshold):
+            return
+
+        moves = list(board.legal_moves)
+        if not moves:
+            if board.is_check():
+                # The side to move is mated
+                self.table[key] = [INFINITY, 0, 0, None]
+            else:
+                self._attacker_fails(board, key)
+            return
+        if plies == 0 or board.is_insufficient_material():
+            self._attacker_fails(board, key)
+            return
+
+        attacking = board.turn == self.attacker
+        if attacking and plies == 1:
+            # Only a checking move can mate on the last ply
+            moves = [move for move in moves if board.gives_check(move)]
+            if not moves:
+                self._attacker_fails(board, key)
+                return
+
+        children = []
+        for move in moves:
+            board.push(move)
+            children.append((move, (chess.polyglot.zobrist_hash(board), plies - 1)))
+            board.pop()
+
+        table = self.table
+        while True:
+            # phi is the smallest child delta, delta the sum of the child phis
+            phi = INFINITY
+            delta = 0
+            best = second_delta = None
+            best_phi = INFINITY
+            for move, child_key in children:
+                child = table.get(child_key)
+                child_phi, child_delta = (child[0], child[1]) if child is not None else (1, 1)
+                delta = min(delta + child_phi, INFINITY)
+                if child_delta < phi:
+                    second_delta = phi
+                    phi = child_delta
+                    best = (move, child_key)
+                    best_phi = child_phi
+                elif second_delta is None or child_delta < second_delta:
+                    second_delta = child_delta
+
+            if phi >= phi_threshold or delta >= delta_threshold or self._out_of_budget():
+                break
+
+            move, child_key = best
+            child_phi_threshold = delta_threshold - delta + best_phi
+            child_delta_threshold = min(phi_threshold, (second_delta if second_delta is not None else INFINITY) + 1)
+            board.push(move)
+            self._mid(board, child_key, child_phi_threshold, child_delta_threshold, plies - 1)
+            board.pop()
+
+        self.table[key] = self._resolve(children, phi, delta, attacking)
+
+    def _resolve(self, children, phi, delta, attacking):
+        """
+        Builds the table entry of a node, working out the mate distance once it is proven.
+        """
+        table = self.table
+        proven = phi == 0 if attacking else delta == 0
+        if not proven:
+            return [phi, delta, None, None]
+
+        if attacking:
+            # Mate through the quickest proven reply
+            distance, move = min(
+                ((table[child_key][2], move) for move, child_key in children
+                 if child_key in table and table[child_key][1] == 0 and table[child_key][2] is not None),
+                key=lambda item: item[0],
+            )
+            return [phi, delta, distance + 1, move]
+
+        # Every defence is proven; the defender picks the longest
+        distance = max(table[child_key][2] for _, child_key in children)
+        return [phi, delta, distance + 1, None]
+
+def detect_mate(fen, max_depth=9, time_limit=None, node_limit=DEFAULT_NODE_LIMIT):
+    """
+    Proof-number search counterpart of checkmate.detect_mate.
+    max_depth is the longest mate searched for, in plies.
+
+    Returns:
+    tuple: (mate_in, move), or (None, None) if no mate was proven within the limits.
+    """
+    search = ProofNumberSearch(max_depth, node_limit, time_limit)
+    return search.solve(chess.Board(fen))
@@ -0,0 +1,614 @@
+import chess
+import chess.polyglot
+import tactics
+import transposition
+
+# Polyglot Zobrist keys, so Position.zobrist equals chess.polyglot.zobrist_hash of the same board
+PIECE_KEYS = [[[chess.polyglot.POLYGLOT_RANDOM_ARRAY[64 * ((piece_type - 1) * 2 + color) + square]
+                for square in chess.SQUARES]
+               for piece_type in range(7)] for color in (chess.BLACK, chess.WHITE)]
+CASTLING_KEYS = [(chess.BB_H1, chess.polyglot.POLYGLOT_RANDOM_ARRAY[768]),
+                 (chess.BB_A1, chess.polyglot.POLYGLOT_RANDOM_ARRAY[769]),
+                 (chess.BB_H8, chess.polyglot.POLYGLOT_RANDOM_ARRAY[770]),
+                 (chess.BB_A8, chess.polyglot.POLYGLOT_RANDOM_ARRAY[771])]
+EN_PASSANT_KEYS = chess.polyglot.POLYGLOT_RANDOM_ARRAY[772:780]
+TURN_KEY = chess.polyglot.POLYGLOT_RANDOM_ARRAY[780]
+
+BB_KNIGHT_ATTACKS = chess.BB_KNIGHT_ATTACKS
+BB_KING_ATTACKS = chess.BB_KING_ATTACKS
+BB_PAWN_ATTACKS = chess.BB_PAWN_ATTACKS
+BB_RANK_ATTACKS = chess.BB_RANK_ATTACKS
+BB_FILE_ATTACKS = chess.BB_FILE_ATTACKS
+BB_DIAG_ATTACKS = chess.BB_DIAG_ATTACKS
+BB_RANK_MASKS = chess.BB_RANK_MASKS
+BB_FILE_MASKS = chess.BB_FILE_MASKS
+BB_DIAG_MASKS = chess.BB_DIAG_MASKS
+BB_SQUARES = chess.BB_SQUARES
+BB_BACKRANKS = [chess.BB_RANK_8, chess.BB_RANK_1]  # Indexed by color
+
+# Castling of standard chess: (rook square, king destination, rook destination, squares that
+# must be empty, squares the king crosses), kingside first as python-chess generates them
+CASTLING = [
+    [(chess.H8, chess.G8, chess.F8, chess.BB_F8 | chess.BB_G8, [chess.E8, chess.F8, chess.G8]),
+     (chess.A8, chess.C8, chess.D8, chess.BB_B8 | chess.BB_C8 | chess.BB_D8, [chess.E8, chess.D8, chess.C8])],
+    [(chess.H1, chess.G1, chess.F1, chess.BB_F1 | chess.BB_G1, [chess.E1, chess.F1, chess.G1]),
+     (chess.A1, chess.C1, chess.D1, chess.BB_B1 | chess.BB_C1 | chess.BB_D1, [chess.E1, chess.D1, chess.C1])],
+]
+KING_SQUARES = [chess.E8, chess.E1]  # Indexed by color
+PROMOTIONS = [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT]
+
+def castling_key(castling_rights):
+    key = 0
+    for mask, rook_key in CASTLING_KEYS:
+        if castling_rights & mask:
+            key ^= rook_key
+    return key
+
+class Position:
+    """
+    Compact position for the search hot path: integer bitboards with the field names of
+    chess.Board, integer moves (see transposition.encode_move), and make/unmake with an undo
+    record instead of a move stack. The polyglot Zobrist key is updated incrementally.
+
+    Moves are generated pseudo-legally, in the order python-chess generates them, and a move is
+    legal if it does not leave the mover's king attacked. Only standard chess castling is
+    supported; a position has no history, so repetitions are not detected.
+
+    Convert with from_board(board) and position.to_board() at the search boundary.
+    """
+
+    __slots__ = ("pawns", "knights", "bishops", "rooks", "queens", "kings", "occupied_co", "occupied",
+                 "turn", "castling_rights", "ep_square", "halfmove_clock", "fullmove_number", "zobrist")
+
+    @classmethod
+    def from_board(cls, board):
+        if board.chess960:
+            raise ValueError("Position does not support Chess960")
+        position = cls()
+        position.pawns = board.pawns
+        position.knights = board.knights
+        position.bishops = board.bishops
+        position.rooks = board.rooks
+        position.queens = board.queens
+        position.kings = board.kings
+        position.occupied_co = [board.occupied_co[chess.BLACK], board.occupied_co[chess.WHITE]]
+        position.occupied = board.occupied
+        position.turn = board.turn
+        position.castling_rights = board.clean_castling_rights()
+        position.ep_square = board.ep_square
+        position.halfmove_clock = board.halfmove_clock
+        position.fullmove_number = board.fullmove_number
+        position.zobrist = chess.polyglot.zobrist_hash(board)
+        return position
+
+    def to_board(self):
+        """
+        Returns a chess.Board of this position (without move history).
+        """
+        board = chess.Board(None)
+        for color in chess.COLORS:
+            for piece_type, mask in [(chess.PAWN, self.pawns), (chess.KNIGHT, self.knights),
+                                     (chess.BISHOP, self.bishops), (chess.ROOK, self.rooks),
+                                     (chess.QUEEN, self.queens), (chess.KING, self.kings)]:
+                for square in chess.scan_forward(mask & self.occupied_co[color]):
+                    board.set_piece_at(square, chess.Piece(piece_type, color))
+        board.turn = self.turn
+        board.castling_rights = self.castling_rights
+        board.ep_square = self.ep_square
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        return board
+
+    def copy(self):
+        position = Position()
+        for name in Position.__slots__:
+            setattr(position, name, getattr(self, name))
+        position.occupied_co = list(self.occupied_co)
+        return position
+
+    def piece_type_at(self, square):
+        mask = BB_SQUARES[square]
+        if not self.occupied & mask:
+            return None
+        if self.pawns & mask:
+            return chess.PAWN
+        if self.knights & mask:
+            return chess.KNIGHT
+        if self.bishops & mask:
+            return chess.BISHOP
+        if self.rooks & mask:
+            return chess.ROOK
+        if self.queens & mask:
+            return chess.QUEEN
+        return chess.KING
+
+    def king(self, color):
+        mask = self.kings & self.occupied_co[color]
+        return chess.msb(mask) if mask else None
+
+    def attacks_mask(self, square):
+        mask = BB_SQUARES[square]
+        if self.knights & mask:
+            return BB_KNIGHT_ATTACKS[square]
+        if self.kings & mask:
+            return BB_KING_ATTACKS[square]
+        if self.pawns & mask:
+            return BB_PAWN_ATTACKS[bool(self.occupied_co[chess.WHITE] & mask)][square]
+        occupied = self.occupied
+        attacks = 0
+        if self.bishops & mask or self.queens & mask:
+            attacks = BB_DIAG_ATTACKS[square][BB_DIAG_MASKS[square] & occupied]
+        if self.rooks & mask or self.queens & mask:
+            attacks |= (BB_RANK_ATTACKS[square][BB_RANK_MASKS[square] & occupied] |
+                        BB_FILE_ATTACKS[square][BB_FILE_MASKS[square] & occupied])
+        return attacks
+
+    def attackers_mask(self, color, square, occupied=None):
+        if occupied is None:
+            occupied = self.occupied
+        queens_and_rooks = self.queens | self.rooks
+        queens_and_bishops = self.queens | self.bishops
+        attackers = ((BB_KING_ATTACKS[square] & self.kings) |
+                     (BB_KNIGHT_ATTACKS[square] & self.knights) |
+                     (BB_RANK_ATTACKS[square][BB_RANK_MASKS[square] & occupied] & queens_and_rooks) |
+                     (BB_FILE_ATTACKS[square][BB_FILE_MASKS[square] & occupied] & queens_and_rooks) |
+                     (BB_DIAG_ATTACKS[square][BB_DIAG_MASKS[square] & occupied] & queens_and_bishops) |
+                     (BB_PAWN_ATTACKS[not color][square] & self.pawns))
+        return attackers & self.occupied_co[color]
+
+    def is_attacked_by(self, color, square):
+        return bool(self.attackers_mask(color, square))
+
+    def is_check(self):
+        king = self.king(self.turn)
+        return king is not None and self.is_attacked_by(not self.turn, king)
+
+    def generate_pseudo_legal_moves(self):
+        """
+        Yields the pseudo-legal moves as integers. Castling moves are only generated when the
+        king does not pass through or land on an attacked square.
+        """
+        turn = self.turn
+        ours = self.occupied_co[turn]
+        theirs = self.occupied_co[not turn]
+        occupied = self.occupied
+
+        for from_square in chess.scan_reversed(ours & ~self.pawns):
+            for to_square in chess.scan_reversed(self.attacks_mask(from_square) & ~ours):
+                yield from_square | to_square << 6
+
+        if self.castling_rights & BB_BACKRANKS[turn] and self.kings & ours & BB_SQUARES[KING_SQUARES[turn]]:
+            for rook, king_to, _, empty, crossed in CASTLING[turn]:
+                if (self.castling_rights & BB_SQUARES[rook] and not occupied & empty
+                        and not any(self.is_attacked_by(not turn, square) for square in crossed)):
+                    yield KING_SQUARES[turn] | king_to << 6
+
+        pawns = self.pawns & ours
+        if not pawns:
+            return
+        for from_square in chess.scan_reversed(pawns):
+            for to_square in chess.scan_reversed(BB_PAWN_ATTACKS[turn][from_square] & theirs):
+                move = from_square | to_square << 6
+                if to_square >> 3 in (0, 7):
+                    yield from (move | promotion << 12 for promotion in PROMOTIONS)
+                else:
+                    yield move
+
+        if turn == chess.WHITE:
+            single_moves = pawns << 8 & ~occupied & chess.BB_ALL
+            double_moves = single_moves << 8 & ~occupied & chess.BB_RANK_4
+            step = -8
+        else:
+            single_moves = pawns >> 8 & ~occupied
+            double_moves = single_moves >> 8 & ~occupied & chess.BB_RANK_5
+            step = 8
+        for to_square in chess.scan_reversed(single_moves):
+            move = (to_square + step) | to_square << 6
+            if to_square >> 3 in (0, 7):
+                yield from (move | promotion << 12 for promotion in PROMOTIONS)
+            else:
+                yield move
+        for to_square in chess.scan_reversed(double_moves):
+            yield (to_square + 2 * step) | to_square << 6
+
+        ep_square = self.ep_square
+        if ep_square is not None and not occupied & BB_SQUARES[ep_square]:
+            capturers = pawns & BB_PAWN_ATTACKS[not turn][ep_square] & (chess.BB_RANK_5 if turn == chess.WHITE else chess.BB_RANK_4)
+            for from_square in chess.scan_reversed(capturers):
+                yield from_square | ep_square << 6
+
+    def is_legal_after_make(self):
+        """
+        After make(move): True if the move did not leave the mover's king in check.
+        """
+        king = self.king(not self.turn)
+        return king is None or not self.is_attacked_by(self.turn, king)
+
+    def generate_legal_moves(self):
+        """
+        Yields the legal moves as integers, in the order of generate_pseudo_legal_moves.
+
+        Legality is decided without making the move: pinned pieces must stay on the line to
+        their king, the king must not step onto an attacked square, and in check other pieces
+        must capture the single checker or block its line. Only en passant captures are
+        verified with make/unmake.
+        """
+        turn = self.turn
+        king = self.king(turn)
+        if king is None:
+            yield from self.generate_pseudo_legal_moves()
+            return
+
+        checkers = self.attackers_mask(not turn, king)
+        if not checkers:
+            evasion_targets = chess.BB_ALL
+        elif checkers & (checkers - 1):
+            evasion_targets = 0  # Double check: only the king can move
+        else:
+            evasion_targets = checkers | chess.between(king, chess.msb(checkers))
+        pinned = tactics.pinned_mask(self, turn) & self.occupied_co[turn]
+        occupied_without_king = self.occupied & ~BB_SQUARES[king]
+        ep_square = self.ep_square
+        for move in self.generate_pseudo_legal_moves():
+            from_square = move & 63
+            to_square = move >> 6 & 63
+            if from_square == king:
+                # Castling moves were only generated through unattacked squares
+                if (to_square - from_square in (2, -2)
+                        or not self.attackers_mask(not turn, to_square, occupied_without_king)):
+                    yield move
+            elif to_square == ep_square and self.pawns & BB_SQUARES[from_square]:
+                if self.is_legal(move):
+                    yield move
+            elif not evasion_targets & BB_SQUARES[to_square]:
+                continue
+            elif pinned & BB_SQUARES[from_square]:
+                if chess.BB_RAYS[king][from_square] & BB_SQUARES[to_square]:
+                    yield move
+            else:
+                yield move
+
+    def legal_moves(self):
+        return list(self.generate_legal_moves())
+
+    def is_legal(self, move):
+        """
+        Checks a pseudo-legal move by making it.
+        """
+        undo = self.make(move)
+        legal = self.is_legal_after_make()
+        self.unmake(move, undo)
+        return legal
+
+    def has_legal_move(self):
+        for _ in self.generate_legal_moves():
+            return True
+        return False
+
+    def is_checkmate(self):
+        return self.is_check() and not self.has_legal_move()
+
+    def check_masks(self):
+        """
+        Returns (targets, discoverers) for the side to move: targets[piece_type] holds the
+        squares from which a piece of that type would attack the enemy king, discoverers our
+        pieces that are the only blocker between one of our sliders and the enemy king.
+        """
+        king = self.king(not self.turn)
+        if king is None:
+            return [0] * 7, 0
+        occupied = self.occupied
+        diagonal = BB_DIAG_ATTACKS[king][BB_DIAG_MASKS[king] & occupied]
+        straight = (BB_RANK_ATTACKS[king][BB_RANK_MASKS[king] & occupied] |
+                    BB_FILE_ATTACKS[king][BB_FILE_MASKS[king] & occupied])
+        targets = [0, BB_PAWN_ATTACKS[not self.turn][king], BB_KNIGHT_ATTACKS[king],
+                   diagonal, straight, diagonal | straight, 0]
+        discoverers = tactics.pinned_mask(self, not self.turn) & self.occupied_co[self.turn]
+        return targets, discoverers
+
+    def gives_check(self, move, check_masks=None):
+        """
+        Checks whether a legal move gives check. Direct and discovered checks are read from
+        check_masks (computed when not given); promotions, castling and en passant are made.
+        """
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        piece_type = self.piece_type_at(from_square)
+        if (move >> 12 or (piece_type == chess.KING and to_square - from_square in (2, -2))
+                or (piece_type == chess.PAWN and to_square == self.ep_square)):
+            undo = self.make(move)
+            check = self.is_check()
+            self.unmake(move, undo)
+            return check
+
+        targets, discoverers = check_masks or self.check_masks()
+        if targets[piece_type] & BB_SQUARES[to_square]:
+            return True
+        if discoverers & BB_SQUARES[from_square]:
+            # The blocker leaves the line between the slider and the king
+            king = self.king(not self.turn)
+            return not chess.BB_RAYS[king][from_square] & BB_SQUARES[to_square]
+        return False
+
+    def generate_checking_moves(self):
+        """
+        Yields the legal moves that give check, direct or discovered, in the order of
+        generate_legal_moves, without making them.
+        """
+        check_masks = self.check_masks()
+        targets, discoverers = check_masks
+        # Squares a direct check can land on; castling, en passant and promotions are left to
+        # gives_check, which makes them
+        reachable = targets[chess.PAWN] | targets[chess.KNIGHT] | targets[chess.QUEEN]
+        king = self.king(self.turn)
+        ep_square = self.ep_square
+        for move in self.generate_legal_moves():
+            from_square = move & 63
+            to_square = move >> 6 & 63
+            if (BB_SQUARES[to_square] & reachable or BB_SQUARES[from_square] & discoverers
+                    or move >> 12 or from_square == king or to_square == ep_square):
+                if self.gives_check(move, check_masks):
+                    yield move
+
+    def mate_in_one(self):
+        """
+        Returns the first legal move that checkmates, or None. Only checking moves are made.
+        """
+        for move in self.generate_checking_moves():
+            undo = self.make(move)
+            mate = not self.has_legal_move()
+            self.unmake(move, undo)
+            if mate:
+                return move
+        return None
+
+    def has_insufficient_material(self, color):
+        """
+        Same rules as chess.Board.has_insufficient_material.
+        """
+        ours = self.occupied_co[color]
+        if ours & (self.pawns | self.rooks | self.queens):
+            return False
+        if ours & self.knights:
+            return chess.popcount(ours) <= 2 and not (self.occupied_co[not color] & ~self.kings & ~self.queens)
+        if ours & self.bishops:
+            same_color = (not self.bishops & chess.BB_DARK_SQUARES) or (not self.bishops & chess.BB_LIGHT_SQUARES)
+            return same_color and not self.pawns and not self.knights
+        return True
+
+    def is_insufficient_material(self):
+        return self.has_insufficient_material(chess.WHITE) and self.has_insufficient_material(chess.BLACK)
+
+    def is_game_over(self):
+        """
+        Checkmate, stalemate, insufficient material or the seventy-five-move rule.
+        """
+        if self.is_insufficient_material():
+            return True
+        if not self.has_legal_move():
+            return True
+        return self.halfmove_clock >= 150
+
+    def _en_passant_key(self):
+        """
+        Polyglot only hashes the en passant file if a pawn of the side to move stands next to it.
+        """
+        ep_square = self.ep_square
+        if ep_square is None:
+            return 0
+        behind = BB_SQUARES[ep_square - 8 if self.turn == chess.WHITE else ep_square + 8]
+        neighbours = ((behind << 1) & ~chess.BB_FILE_A & chess.BB_ALL) | ((behind >> 1) & ~chess.BB_FILE_H)
+        if neighbours & self.pawns & self.occupied_co[self.turn]:
+            return EN_PASSANT_KEYS[ep_square & 7]
+        return 0
+
+    def _toggle(self, piece_type, color, mask):
+        if piece_type == chess.PAWN:
+            self.pawns ^= mask
+        elif piece_type == chess.KNIGHT:
+            self.knights ^= mask
+        elif piece_type == chess.BISHOP:
+            self.bishops ^= mask
+        elif piece_type == chess.ROOK:
+            self.rooks ^= mask
+        elif piece_type == chess.QUEEN:
+            self.queens ^= mask
+        else:
+            self.kings ^= mask
+        self.occupied_co[color] ^= mask
+        self.occupied ^= mask
+
+    def make(self, move):
+        """
+        Makes an integer move and returns the undo record to pass to unmake.
+        The move must be pseudo-legal.
+        """
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        promotion = move >> 12
+        turn = self.turn
+        piece_type = self.piece_type_at(from_square)
+        captured = self.piece_type_at(to_square)
+        undo = (piece_type, captured, self.castling_rights, self.ep_square, self.halfmove_clock, self.zobrist)
+
+        castling_rights = self.castling_rights
+        key = self.zobrist ^ self._en_passant_key()
+        ep_square = self.ep_square
+        self.ep_square = None
+        self.halfmove_clock += 1
+
+        if captured is not None:
+            self._toggle(captured, not turn, BB_SQUARES[to_square])
+            key ^= PIECE_KEYS[not turn][captured][to_square]
+            self.halfmove_clock = 0
+
+        self._toggle(piece_type, turn, BB_SQUARES[from_square])
+        key ^= PIECE_KEYS[turn][piece_type][from_square]
+        placed = promotion or piece_type
+        self._toggle(placed, turn, BB_SQUARES[to_square])
+        key ^= PIECE_KEYS[turn][placed][to_square]
+
+        if piece_type == chess.PAWN:
+            self.halfmove_clock = 0
+            if to_square == ep_square and captured is None:
+                captured_square = to_square - 8 if turn == chess.WHITE else to_square + 8
+                self._toggle(chess.PAWN, not turn, BB_SQUARES[captured_square])
+                key ^= PIECE_KEYS[not turn][chess.PAWN][captured_square]
+            elif to_square - from_square == 16 or from_square - to_square == 16:
+                self.ep_square = (from_square + to_square) >> 1
+        elif piece_type == chess.KING:
+            self.castling_rights &= ~BB_BACKRANKS[turn]
+            if to_square - from_square == 2 or from_square - to_square == 2:
+                for rook, king_to, rook_to, _, _ in CASTLING[turn]:
+                    if king_to == to_square:
+                        self._toggle(chess.ROOK, turn, BB_SQUARES[rook] | BB_SQUARES[rook_to])
+                        key ^= PIECE_KEYS[turn][chess.ROOK][rook] ^ PIECE_KEYS[turn][chess.ROOK][rook_to]
+        self.castling_rights &= ~BB_SQUARES[from_square] & ~BB_SQUARES[to_square]
+
+        if turn == chess.BLACK:
+            self.fullmove_number += 1
+        self.turn = not turn
+        if self.castling_rights != castling_rights:
+            key ^= castling_key(castling_rights) ^ castling_key(self.castling_rights)
+        self.zobrist = key ^ TURN_KEY ^ self._en_passant_key()
+        return undo
+
+    def unmake(self, move, undo):
+        """
+        Takes back the move made by make, restoring the position from the undo record.
+        """
+        piece_type, captured, castling_rights, ep_square, halfmove_clock, zobrist = undo
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        promotion = move >> 12
+        self.turn = turn = not self.turn
+        if turn == chess.BLACK:
+            self.fullmove_number -= 1
+
+        self._toggle(promotion or piece_type, turn, BB_SQUARES[to_square])
+        self._toggle(piece_type, turn, BB_SQUARES[from_square])
+        if captured is not None:
+            self._toggle(captured, not turn, BB_SQUARES[to_square])
+        elif piece_type == chess.PAWN and to_square == ep_square:
+            captured_square = to_square - 8 if turn == chess.WHITE else to_square + 8
+            self._toggle(chess.PAWN, not turn, BB_SQUARES[captured_square])
+        elif piece_type == chess.KING and (to_square - from_square == 2 or from_square - to_square == 2):
+            for rook, king_to, rook_to, _, _ in CASTLING[turn]:
+                if king_to == to_square:
+                    self._toggle(chess.ROOK, turn, BB_SQUARES[rook] | BB_SQUARES[rook_to])
+
+        self.castling_rights = castling_rights
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.zobrist = zobrist
+
+    def make_null(self):
+        """
+        Passes the turn, as board.push(chess.Move.null()) does. Returns the undo record for
+        unmake_null.
+        """
+        undo = (self.ep_square, self.halfmove_clock, self.zobrist)
+        key = self.zobrist ^ self._en_passant_key()
+        self.ep_square = None
+        self.halfmove_clock += 1
+        if self.turn == chess.BLACK:
+            self.fullmove_number += 1
+        self.turn = not self.turn
+        self.zobrist = key ^ TURN_KEY
+        return undo
+
+    def unmake_null(self, undo):
+        self.turn = not self.turn
+        if self.turn == chess.BLACK:
+            self.fullmove_number -= 1
+        self.ep_square, self.halfmove_clock, self.zobrist = undo
+
+class BoardPosition:
+    """
+    Stand-in for Position on boards it cannot represent (Chess960): the same integer moves and
+    make/unmake calls, played on a copy of the chess.Board. Other attributes, such as the
+    bitboards, turn and is_check, are read from the board.
+    """
+
+    def __init__(self, board):
+        self.board = board.copy(stack=False)
+
+    def __getattr__(self, name):
+        return getattr(self.board, name)
+
+    @property
+    def zobrist(self):
+        return chess.polyglot.zobrist_hash(self.board)
+
+    def to_board(self):
+        return self.board.copy(stack=False)
+
+    def copy(self):
+        return BoardPosition(self.board)
+
+    def generate_legal_moves(self):
+        for move in self.board.generate_legal_moves():
+            yield transposition.encode_move(move)
+
+    def legal_moves(self):
+        return list(self.generate_legal_moves())
+
+    def is_legal(self, move):
+        return self.board.is_legal(transposition.decode_move(move))
+
+    def has_legal_move(self):
+        return any(self.board.generate_legal_moves())
+
+    def gives_check(self, move, check_masks=None):
+        return self.board.gives_check(transposition.decode_move(move))
+
+    def generate_checking_moves(self):
+        for move in self.board.generate_legal_moves():
+            if self.board.gives_check(move):
+                yield transposition.encode_move(move)
+
+    def mate_in_one(self):
+        for move in self.generate_checking_moves():
+            undo = self.make(move)
+            mate = not self.has_legal_move()
+            self.unmake(move, undo)
+            if mate:
+                return move
+        return None
+
+    def is_game_over(self):
+        return self.board.is_game_over()
+
+    def make(self, move):
+        self.board.push(transposition.decode_move(move))
+
+    def unmake(self, move, undo):
+        self.board.pop()
+
+    def make_null(self):
+        self.board.push(chess.Move.null())
+
+    def unmake_null(self, undo):
+        self.board.pop()
+
+def from_board(board):
+    """
+    Returns a Position of board, or a BoardPosition if Position cannot represent it.
+    """
+    if board.chess960:
+        return BoardPosition(board)
+    return Position.from_board(board)
+
+def perft(position, depth):
+    """
+    Counts the leaf nodes of the legal move tree to the given depth.
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in position.generate_pseudo_legal_moves():
+        undo = position.make(move)
+        if position.is_legal_after_make():
+            nodes += perft(position, depth - 1) if depth > 1 else 1
+        position.unmake(move, undo)
+    return nodes
@@ -0,0 +1,134 @@
+import json
+import time
+import chess
+import checkmate
+import engine
+import openings
+import smp
+import tactics
+
+# Evaluation terms timed by the profiler: (owner, attribute, term name). The owner's attribute
+# is replaced by a timing wrapper while profiling is enabled and restored afterwards, so a
+# disabled profiler costs nothing.
+EVALUATION_TERMS = [
+    (engine, "evaluate_board", "total"),
+    (engine, "evaluate_position", "uncached"),
+    (engine, "evaluate_material_and_position", "material_and_pst"),
+    (engine.IncrementalEvaluator, "material_and_position", "material_and_pst"),
+    (engine, "is_endgame", "game_phase"),
+    (engine, "evaluate_pawns", "pawn_structure"),
+    (tactics, "evaluate_tactics", "tactics"),
+    (engine, "evaluate_rook_activity", "rook_activity"),
+    (engine, "penalize_early_queen_use", "early_queen"),
+    (engine, "evaluate_king_safety", "king_safety"),
+    (engine, "check_development_penalty", "development"),
+    (engine, "penalize_multiple_piece_moves", "multiple_piece_moves"),
+    (engine, "evaluate_history_terms", "history"),
+]
+
+# Stages of engine.run_chess_bot
+STAGES = [
+    (openings, "find_move_in_book", "book"),
+    (engine, "RootMoves", "root_moves"),
+    (checkmate, "detect_mate", "detect_mate"),
+    (engine, "iterative_deepening", "search"),
+    (smp.LazySMPSearch, "search", "search"),
+]
+
+class Profiler:
+    """
+    Opt-in instrumentation of the engine: call counts and cumulative time of every evaluation
+    term, wall time of every stage of engine.run_chess_bot, the search statistics of the
+    last search (nodes per depth, branching factor, cutoffs) and the evaluation cache counters.
+
+    Only the calling process is instrumented; work done in the mate pool or by Lazy SMP workers
+    shows up as the wall time of its stage.
+    """
+
+    def __init__(self):
+        self.terms = {}
+        self.stages = {}
+        self._saved = []
+
+    def reset(self):
+        self.terms = {}
+        self.stages = {}
+
+    def _wrap(self, function, counters, name):
+        counter = counters.setdefault(name, [0, 0.0])
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                counter[0] += 1
+                counter[1] += time.perf_counter() - start
+        return timed
+
+    def enable(self):
+        """
+        Installs the timing wrappers. Does nothing if the profiler is already enabled.
+        """
+        if self._saved:
+            return
+        for targets, counters in ((EVALUATION_TERMS, self.terms), (STAGES, self.stages)):
+            for owner, attribute, name in targets:
+                function = getattr(owner, attribute)
+                self._saved.append((owner, attribute, function))
+                setattr(owner, attribute, self._wrap(function, counters, name))
+
+    def disable(self):
+        """
+        Restores the original functions.
+        """
+        for owner, attribute, function in reversed(self._saved):
+            setattr(owner, attribute, function)
+        self._saved = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def report(self):
+        """
+        Returns the collected data as a dictionary.
+        """
+        return {
+            "terms": {name: {"calls": calls, "time": seconds} for name, (calls, seconds) in self.terms.items()},
+            "stages": {name: seconds for name, (calls, seconds) in self.stages.items() if calls},
+            "search": engine.stats.as_dict(),
+            "evaluation_cache": engine.evaluation_cache.stats(),
+        }
+
+def profile_move(board, log_file=None, **kwargs):
+    """
+    Runs engine.run_chess_bot with profiling enabled.
+
+    Arguments:
+    board: chess.Board() object representing the current board state.
+    log_file: Optional path; the report is appended to it as one JSON line.
+    kwargs: Passed on to engine.run_chess_bot (depth, time_left, increment, movetime, moves_to_go).
+
+    Returns:
+    tuple: (move, report) where report is Profiler.report() extended with the position,
+    the move and the total wall time.
+    """
+    fen = board.fen()
+    engine.stats.reset()
+    profiler = Profiler()
+    start = time.perf_counter()
+    with profiler:
+        move = engine.run_chess_bot(board, **kwargs)
+    report = profiler.report()
+    report["fen"] = fen
+    report["move"] = move.uci() if isinstance(move, chess.Move) else None
+    report["time"] = time.perf_counter() - start
+
+    if log_file is not None:
+        with open(log_file, "a") as log:
+            log.write(json.dumps(report) + "\n")
+    return move, report
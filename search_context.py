@@ -0,0 +1,136 @@
+import chess
+import position
+import transposition
+
+REPEATED_MOVE_PENALTY = 50  # Per extra move of the same piece in the early game
+
+class SearchContext:
+    """
+    Game history features of a board, updated move by move instead of replaying the move
+    stack at every evaluated position:
+    - Zobrist keys of every position of the game, counted for repetition detection;
+    - how often each individual piece has moved, and the resulting repeated move penalty
+      per color.
+
+    The context is built from the whole game once and then follows the search: use
+    push(move) and pop() alongside board.push and board.pop.
+    """
+
+    def __init__(self, board):
+        self.reset(board)
+
+    def reset(self, board):
+        root = board.root()
+        self.position = position.from_board(root)
+        self.key_counts = {self.position.zobrist: 1}
+        # Pieces are identified by their square at the start of the game
+        self._piece_ids = [square if root.piece_type_at(square) else None for square in chess.SQUARES]
+        self._move_counts = [0] * 64
+        self.repeated_moves = [0, 0]  # Extra moves of already moved pieces, indexed by color
+        self._stack = []
+        for move in board.move_stack:
+            self.push(move)
+
+    def key(self):
+        """
+        Zobrist key of the current position (chess.polyglot.zobrist_hash).
+        """
+        return self.position.zobrist
+
+    def push(self, move):
+        """
+        Updates the context for move, which must be legal in the current position.
+        """
+        compact = self.position
+        color = compact.turn
+        if not move:
+            self._stack.append((None, compact.make_null(), None, None))
+            self._count_key()
+            return
+
+        from_square, to_square = move.from_square, move.to_square
+        ids = self._piece_ids
+        piece_id = ids[from_square]
+        castling = self._castling(from_square, to_square, color)
+        if castling:
+            rook, king_to, rook_to = castling
+            changed = [(square, ids[square]) for square in (from_square, rook, king_to, rook_to)]
+            rook_id = ids[rook]
+            ids[from_square] = ids[rook] = None
+            ids[king_to] = piece_id
+            ids[rook_to] = rook_id
+        else:
+            changed = [(from_square, piece_id), (to_square, ids[to_square])]
+            if compact.pawns & chess.BB_SQUARES[from_square] and to_square == compact.ep_square:
+                captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+                changed.append((captured_square, ids[captured_square]))
+                ids[captured_square] = None
+            ids[to_square] = piece_id
+            ids[from_square] = None
+
+        code = transposition.encode_move(move)
+        undo = compact.make(code)
+        repeated = 0
+        if piece_id is not None:
+            repeated = 1 if self._move_counts[piece_id] else 0
+            self._move_counts[piece_id] += 1
+            self.repeated_moves[color] += repeated
+        self._stack.append((code, undo, changed, (piece_id, repeated)))
+        self._count_key()
+
+    def _castling(self, from_square, to_square, color):
+        """
+        Returns (rook square, king destination, rook destination) if the move from from_square
+        to to_square castles, else None. Standard castling moves the king two squares, Chess960
+        castling moves it onto its own rook.
+        """
+        compact = self.position
+        if not compact.kings & chess.BB_SQUARES[from_square]:
+            return None
+        if compact.rooks & compact.occupied_co[color] & chess.BB_SQUARES[to_square]:
+            rook = to_square
+        elif to_square - from_square in (2, -2):
+            rook = from_square & ~7 | (7 if to_square > from_square else 0)
+        else:
+            return None
+        back_rank = from_square & ~7
+        if rook > from_square:
+            return rook, back_rank | 6, back_rank | 5
+        return rook, back_rank | 2, back_rank | 3
+
+    def pop(self):
+        """
+        Takes back the last pushed move.
+        """
+        compact = self.position
+        self.key_counts[compact.zobrist] -= 1
+        code, undo, changed, restore = self._stack.pop()
+        if code is None:
+            compact.unmake_null(undo)
+            return
+
+        compact.unmake(code, undo)
+        piece_id, repeated = restore
+        if piece_id is not None:
+            self._move_counts[piece_id] -= 1
+            self.repeated_moves[compact.turn] -= repeated
+        ids = self._piece_ids
+        for square, piece_id in reversed(changed):
+            ids[square] = piece_id
+
+    def _count_key(self):
+        key = self.position.zobrist
+        self.key_counts[key] = self.key_counts.get(key, 0) + 1
+
+    def is_repetition(self, count=3):
+        """
+        True if the current position occurred at least count times in the game, like
+        board.is_repetition.
+        """
+        return self.key_counts[self.position.zobrist] >= count
+
+    def repeated_move_penalty(self, color):
+        """
+        Penalty for the extra moves color made with pieces that had already moved.
+        """
+        return self.repeated_moves[color] * REPEATED_MOVE_PENALTY
@@ -0,0 +1,59 @@
+class SearchStats:
+    """
+    Counters collected by engine.negamax during one iterative deepening search.
+    nodes counts main search nodes, quiescence_nodes the nodes of the capture search at the leaves.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.nodes_by_depth = {}  # Iteration depth -> nodes searched by that iteration
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.null_move_cutoffs = 0
+        self.reductions = 0
+        self.re_searches = 0
+        self.pv_re_searches = 0  # Zero window searches of principal variation search that failed high
+        self.aspiration_fails = 0
+        self.futility_prunes = 0
+
+    def finish_iteration(self, depth, nodes_before):
+        """
+        Records the nodes searched by the iteration at the given depth.
+        """
+        self.nodes_by_depth[depth] = self.nodes - nodes_before
+
+    def branching_factors(self):
+        """
+        Growth of the node count from each iteration to the next: nodes of depth d divided by
+        nodes of depth d - 1.
+        """
+        return {depth: nodes / self.nodes_by_depth[depth - 1]
+                for depth, nodes in self.nodes_by_depth.items()
+                if self.nodes_by_depth.get(depth - 1)}
+
+    def first_move_cutoff_rate(self):
+        """
+        Share of beta cutoffs produced by the first move searched, a measure of move ordering quality.
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def as_dict(self):
+        return {
+            "nodes": self.nodes,
+            "quiescence_nodes": self.quiescence_nodes,
+            "nodes_by_depth": dict(self.nodes_by_depth),
+            "branching_factors": self.branching_factors(),
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate(),
+            "null_move_cutoffs": self.null_move_cutoffs,
+            "reductions": self.reductions,
+            "re_searches": self.re_searches,
+            "pv_re_searches": self.pv_re_searches,
+            "aspiration_fails": self.aspiration_fails,
+            "futility_prunes": self.futility_prunes,
+        }
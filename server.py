@@ -0,0 +1,304 @@
+import argparse
+import asyncio
+import collections
+import json
+import math
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import chess
+import engine
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_GAME_TIME = 300.0  # Seconds on a game's clock unless the new request sets it
+DEFAULT_INCREMENT = 0.0
+PENDING_PER_PROCESS = 4  # Queued move requests per worker before clients are made to wait
+LATENCY_WINDOW = 1000  # Most recent moves the latency percentiles are computed over
+THROUGHPUT_WINDOW = 60.0  # Seconds the throughput is averaged over
+
+# Worker process side
+
+def _init_worker():
+    # Pool workers cannot start the engine's mate search pool, so the mate search runs in-process
+    engine.MATE_SEARCH_BACKEND = "pns"
+
+def warm_up():
+    """
+    Runs once in every worker at startup so the first real move does not pay for process start.
+    """
+    return engine.run_chess_bot(chess.Board(), depth=1) is not None
+
+def play_move(fen, moves, time_left, increment):
+    """
+    Pool task: picks the engine's move in the position after moves (UCI strings) from fen, on the
+    clock of the game. The worker's tables stay warm from one request to the next.
+    """
+    board = chess.Board(fen)
+    for move in moves:
+        board.push_uci(move)
+    move = engine.run_chess_bot(board, time_left=time_left, increment=increment)
+    return move.uci() if move else None
+
+# Server side
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def request_error(request):
+    """
+    Returns why a decoded request is malformed, or None if its fields have the right types.
+    """
+    if not isinstance(request, dict):
+        return "request must be a JSON object"
+    kind = request.get("type")
+    if kind in ("new", "move", "end"):
+        game = request.get("game")
+        if isinstance(game, bool) or not isinstance(game, (str, int)):
+            return '"game" must be a string or an integer'
+    if kind == "new":
+        for field in ("time", "increment"):
+            value = request.get(field, 0)
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if not is_number or not math.isfinite(value) or value < 0:
+                return f'"{field}" must be a non-negative number of seconds'
+    elif kind == "move":
+        if not isinstance(request.get("fen", ""), str):
+            return '"fen" must be a string'
+        moves = request.get("moves", [])
+        if not isinstance(moves, list) or not all(isinstance(move, str) for move in moves):
+            return '"moves" must be a list of UCI strings'
+    return None
+
+class Game:
+    """
+    Clock of one game: the engine's remaining time, charged with the wall time of every move
+    request from its arrival (queue wait included) to the reply.
+    """
+
+    def __init__(self, time_left=DEFAULT_GAME_TIME, increment=DEFAULT_INCREMENT):
+        self.time_left = time_left
+        self.increment = increment
+        self.pending = False
+        self.moves = 0
+
+class GameServer:
+    """
+    Asyncio server hosting many concurrent games on a fixed pool of warm engine processes.
+
+    Clients speak newline-delimited JSON over a local socket; every request is an object and
+    may carry an "id" that is echoed in its reply. Malformed requests get an error reply:
+    - {"type": "new", "game": G, "time": seconds, "increment": seconds} starts a game clock;
+    - {"type": "move", "game": G, "fen": F, "moves": [uci, ...]} asks for the engine's move in
+      the position after moves from F (default: the start position). Games that were not
+      started with new get the default clock. Replies come as the searches finish, so they
+      may arrive in a different order than the requests;
+    - {"type": "end", "game": G} frees the game;
+    - {"type": "metrics"} returns queue depth, move latency percentiles and throughput.
+
+    Move requests wait in a bounded queue. When it is full the server stops reading from the
+    connection that sent the request until a slot frees up (backpressure). A game can only
+    have one move request in flight, and a game whose clock runs out gets an error instead
+    of a move.
+    """
+
+    def __init__(self, processes=None, max_pending=None):
+        self.processes = processes or multiprocessing.cpu_count()
+        self.max_pending = max_pending or self.processes * PENDING_PER_PROCESS
+        self.games = {}
+        self._executor = None
+        self._queue = None
+        self._dispatchers = []
+        self._server = None
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._completed = collections.deque()  # Finish times of the moves of the last THROUGHPUT_WINDOW
+        self.moves_played = 0
+        self.errors = 0
+        self.disconnects = 0  # Move replies lost because their client had gone
+        self.in_flight = 0
+        self.started = time.time()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        loop = asyncio.get_running_loop()
+        self._executor = ProcessPoolExecutor(self.processes, initializer=_init_worker)
+        await asyncio.gather(*[loop.run_in_executor(self._executor, warm_up) for _ in range(self.processes)])
+        self._queue = asyncio.Queue(self.max_pending)
+        self._dispatchers = [self._start_dispatcher() for _ in range(self.processes)]
+        self._server = await asyncio.start_server(self.handle_connection, host, port)
+        self.started = time.time()
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for dispatcher in list(self._dispatchers):
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        lock = asyncio.Lock()
+
+        async def send(message):
+            async with lock:
+                writer.write((json.dumps(message) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await send({"type": "error", "message": "invalid JSON"})
+                    continue
+                await self.handle_request(request, send)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request, send):
+        error = request_error(request)
+        if error is not None:
+            request_id = request.get("id") if isinstance(request, dict) else None
+            await send({"id": request_id, "type": "error", "message": error})
+            return
+
+        kind = request.get("type")
+        reply = {"id": request.get("id"), "game": request.get("game")}
+        if kind == "metrics":
+            await send(dict(reply, type="metrics", **self.metrics()))
+        elif kind == "new":
+            self.games[request["game"]] = Game(float(request.get("time", DEFAULT_GAME_TIME)),
+                                               float(request.get("increment", DEFAULT_INCREMENT)))
+            await send(dict(reply, type="ok"))
+        elif kind == "end":
+            self.games.pop(request["game"], None)
+            await send(dict(reply, type="ok"))
+        elif kind == "move":
+            game = self.games.setdefault(request["game"], Game())
+            if game.pending:
+                self.errors += 1
+                await send(dict(reply, type="error", message="a move is already pending for this game"))
+                return
+            game.pending = True
+            # Blocks while the queue is full, so this connection is not read any further
+            await self._queue.put((time.time(), game, request, reply, send))
+        else:
+            await send(dict(reply, type="error", message=f"unknown request type: {kind}"))
+
+    def _start_dispatcher(self):
+        dispatcher = asyncio.create_task(self._dispatch())
+        dispatcher.add_done_callback(self._dispatcher_done)
+        return dispatcher
+
+    def _dispatcher_done(self, dispatcher):
+        """
+        Replaces a dispatcher that died, so the pool keeps one dispatcher per worker.
+        """
+        if dispatcher.cancelled():
+            return  # Server shutdown
+        print(f"dispatcher failed: {dispatcher.exception()!r}; restarting it", file=sys.stderr)
+        self._dispatchers.remove(dispatcher)
+        self._dispatchers.append(self._start_dispatcher())
+
+    async def _reply(self, send, message):
+        """
+        Sends a move reply. A client that disconnected while its move was searched only loses
+        its own reply; the dispatcher goes on with the next request.
+        """
+        try:
+            await send(message)
+        except ConnectionError:
+            self.disconnects += 1
+
+    async def _dispatch(self):
+        """
+        Feeds queued move requests to the pool, one at a time; one dispatcher runs per worker.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            received, game, request, reply, send = await self._queue.get()
+            try:
+                time_left = game.time_left - (time.time() - received)
+                if time_left <= 0:
+                    self.errors += 1
+                    await self._reply(send, dict(reply, type="error", message="time budget exhausted"))
+                    continue
+                self.in_flight += 1
+                try:
+                    move = await loop.run_in_executor(self._executor, play_move,
+                                                      request.get("fen", chess.STARTING_FEN),
+                                                      request.get("moves", []), time_left, game.increment)
+                except Exception as error:
+                    self.errors += 1
+                    await self._reply(send, dict(reply, type="error", message=str(error)))
+                    continue
+                finally:
+                    self.in_flight -= 1
+
+                now = time.time()
+                latency = now - received
+                game.time_left += game.increment - latency
+                game.moves += 1
+                self.moves_played += 1
+                self._latencies.append(latency)
+                self._completed.append(now)
+                await self._reply(send, dict(reply, type="move", move=move, latency=latency, time_left=game.time_left))
+            finally:
+                game.pending = False
+                self._queue.task_done()
+
+    def metrics(self):
+        now = time.time()
+        while self._completed and self._completed[0] < now - THROUGHPUT_WINDOW:
+            self._completed.popleft()
+        window = min(THROUGHPUT_WINDOW, now - self.started)
+        return {
+            "games": len(self.games),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "processes": self.processes,
+            "moves_played": self.moves_played,
+            "errors": self.errors,
+            "disconnects": self.disconnects,
+            "latency_p50": percentile(self._latencies, 0.5),
+            "latency_p99": percentile(self._latencies, 0.99),
+            "moves_per_second": len(self._completed) / window if window > 0 else 0.0,
+        }
+
+async def serve(host, port, processes, max_pending):
+    server = GameServer(processes, max_pending)
+    listener = await server.start(host, port)
+    print(f"serving on {host}:{port} with {server.processes} engine processes", file=sys.stderr)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-game engine server (newline-delimited JSON over TCP)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--processes", type=int, default=None, help="Engine processes (default: one per core)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help=f"Queued move requests before clients wait (default: {PENDING_PER_PROCESS} per process)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.processes, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
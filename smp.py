@@ -0,0 +1,122 @@
+import time
+import multiprocessing
+import chess
+import engine
+import transposition
+
+_active_search = None
+_worker_table = None
+
+def _init_worker(table_name, table_size_mb, active_search):
+    global _active_search, _worker_table
+    _active_search = active_search
+    _worker_table = transposition.SharedTranspositionTable(table_size_mb, name=table_name)
+    engine.transposition_table = _worker_table
+
+def helper_depths(worker, max_depth):
+    """
+    Returns the (start_depth, max_depth) a worker searches with. Worker 0 is the main search;
+    odd helpers start and end one ply deeper, so at any moment the workers are spread over
+    two iteration depths and fill the shared table for each other.
+    """
+    if worker == 0:
+        return 1, max_depth
+    offset = worker % 2
+    return 1 + offset, max_depth + offset
+
+def _search_task(task):
+    """
+    Pool task: one worker's iterative deepening search of the shared root position.
+    """
+    search_id, root_fen, moves, worker, max_depth, soft_limit, hard_limit, start_time = task
+    board = chess.Board(root_fen)
+    for move in moves:
+        board.push(move)
+
+    start_depth, max_depth = helper_depths(worker, max_depth)
+    score, move, depth = engine.iterative_deepening(
+        board, max_depth, soft_limit, hard_limit, start_time, start_depth=start_depth,
+        stop=lambda: _active_search.value != search_id)
+    nodes = engine.stats.nodes + engine.stats.quiescence_nodes
+
+    if worker == 0:
+        # The main search is done; the helpers stop at their next node check
+        with _active_search.get_lock():
+            if _active_search.value == search_id:
+                _active_search.value = 0
+    return worker, score, move, depth, nodes
+
+class LazySMPSearch:
+    """
+    Lazy SMP: every worker process runs its own iterative deepening search of the same root
+    position, all of them reading and writing one SharedTranspositionTable. Workers are
+    staggered over iteration depths (see helper_depths) and speed each other up through the
+    entries they share. When the main worker finishes, the helpers are cancelled and the
+    move of the deepest completed search is played.
+    """
+
+    def __init__(self, processes=None, tt_size_mb=transposition.DEFAULT_SIZE_MB):
+        self.processes = processes or multiprocessing.cpu_count()
+        self.table = transposition.SharedTranspositionTable(tt_size_mb)
+        self.nodes = 0
+        self._active_search = multiprocessing.Value('q', 0)
+        self._search_id = 0
+        self._pool = multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                          initargs=(self.table.name, tt_size_mb, self._active_search))
+
+    def search(self, board, max_depth=None, soft_limit=None, hard_limit=None, start_time=None, root_moves=None):
+        """
+        Searches the board on all workers. Takes the same limits as engine.iterative_deepening;
+        max_depth defaults to engine.MAX_SEARCH_DEPTH. The mates of root_moves (an
+        engine.RootMoves) are seeded into the shared table before the workers start.
+
+        Returns:
+        tuple: (score, best_move, depth) of the deepest completed search; the main worker wins ties.
+        """
+        if max_depth is None:
+            max_depth = engine.MAX_SEARCH_DEPTH
+        if start_time is None:
+            start_time = time.time()
+        self.table.new_search()
+        if root_moves is not None:
+            root_moves.seed(self.table)
+        self._search_id += 1
+        self._active_search.value = self._search_id
+
+        root = board.root()
+        tasks = [(self._search_id, root.fen(), list(board.move_stack), worker, max_depth,
+                  soft_limit, hard_limit, start_time) for worker in range(self.processes)]
+        best = None
+        self.nodes = 0
+        try:
+            for worker, score, move, depth, nodes in self._pool.imap_unordered(_search_task, tasks):
+                self.nodes += nodes
+                if move is None:
+                    continue
+                if best is None or depth > best[0] or (depth == best[0] and worker < best[1]):
+                    best = (depth, worker, score, move)
+        finally:
+            self._active_search.value = 0
+
+        if best is None:
+            return None, None, 0
+        depth, _, score, move = best
+        return score, move, depth
+
+    def close(self):
+        """
+        Cancels any running search, shuts the workers down and frees the shared table.
+        """
+        if self._pool is None:
+            return
+        self._active_search.value = 0
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+        self.table.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
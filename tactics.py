@@ -1,5 +1,4 @@
 import chess
-import threading
 
 # Define piece values
 piece_values = {
@@ -11,100 +10,150 @@ piece_values = {
     chess.KING: 0
 }
 
-def detect_forks(board, attacks_cache, result, index):
+def mask_value(board, mask):
+    """
+    Returns the summed piece values of all pieces on the squares in mask.
+    """
+    if not mask:
+        return 0
+    return (chess.popcount(mask & board.pawns) * piece_values[chess.PAWN] +
+            chess.popcount(mask & board.knights) * piece_values[chess.KNIGHT] +
+            chess.popcount(mask & board.bishops) * piece_values[chess.BISHOP] +
+            chess.popcount(mask & board.rooks) * piece_values[chess.ROOK] +
+            chess.popcount(mask & board.queens) * piece_values[chess.QUEEN])
+
+def pinned_mask(board, color):
+    """
+    Returns the squares that board.is_pinned(color, square) reports as pinned, restricted to
+    occupied squares: the single piece (of either color) standing between color's king and an
+    enemy slider on the same line.
+    """
+    king = board.king(color)
+    if king is None:
+        return 0
+
+    occupied = board.occupied
+    enemies = board.occupied_co[not color]
+    pinned = 0
+    for attacks, sliders in [(chess.BB_FILE_ATTACKS, board.rooks | board.queens),
+                             (chess.BB_RANK_ATTACKS, board.rooks | board.queens),
+                             (chess.BB_DIAG_ATTACKS, board.bishops | board.queens)]:
+        for sniper in chess.scan_reversed(attacks[king][0] & sliders & enemies):
+            blockers = chess.between(sniper, king) & occupied
+            if blockers and not blockers & (blockers - 1):
+                pinned |= blockers
+    return pinned
+
+def tactic_components(board):
+    """
+    Computes the fork, skewer, pin and discovered attack scores in a single pass over the board.
+
+    Attacks are generated once per piece and pins once per position. Forks count knights and
+    pawns attacking two or more more valuable pieces (a queen has no more valuable target).
+    Sliders score the pieces they attack that are pinned to the king of the side not to move
+    (reported as both skewers and pins), and the pieces attacked by sliders that are
+    themselves pinned (discovered attacks).
+
+    Returns:
+    tuple: (fork, skewer, pin, discovered attack) scores.
+    """
+    occupied = board.occupied
     fork_score = 0
-    # Check knights, queens, and now pawns for possible forks
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece is None or piece.piece_type not in {chess.KNIGHT, chess.QUEEN, chess.PAWN}:
-            continue
-
-        if piece.piece_type == chess.PAWN:
-            pawn_attack_squares = board.attacks(square) 
-            targets = [target for target in pawn_attack_squares
-                       if board.piece_at(target) and piece_values[board.piece_at(target).piece_type] > piece_values[chess.PAWN]]
-        else:
-            attackers = attacks_cache.get(square, set())
-            targets = [target for target in board.attacks(square)
-                       if board.piece_at(target) and piece_values[board.piece_at(target).piece_type] > piece_values[piece.piece_type]]
-          
-        if len(targets) >= 2:
-            fork_score += sum(piece_values[board.piece_at(target).piece_type] for target in targets)
-
-    result[index] = fork_score
-
-
-def detect_skewers(board, attacks_cache, result, index):
     skewer_score = 0
-    # Long-range pieces: bishops, rooks, queens
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece is None or piece.piece_type not in {chess.BISHOP, chess.ROOK, chess.QUEEN}:
-            continue
-        
-        for target_square in board.attacks(square):
-            # Check for skewer conditions
-            if board.piece_at(target_square) and board.is_pinned(not board.turn, target_square):
-                skewer_score += piece_values[board.piece_at(target_square).piece_type]
-
-    result[index] = skewer_score
-
-def detect_pins(board, attacks_cache, result, index):
-    pin_score = 0
-    # Long-range pieces: bishops, rooks, queens
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece is None or piece.piece_type not in {chess.BISHOP, chess.ROOK, chess.QUEEN}:
-            continue
-
-        for target_square in board.attacks(square):
-            if board.is_pinned(not board.turn, target_square):
-                pinned_piece = board.piece_at(target_square)
-                if pinned_piece:
-                    pin_score += piece_values[pinned_piece.piece_type]
-
-    result[index] = pin_score
-
-def detect_discovered_attacks(board, attacks_cache, result, index):
     discovered_attack_score = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type in {chess.BISHOP, chess.ROOK, chess.QUEEN}:
-            for target_square in board.attacks(square):
-                if board.is_pinned(not board.turn, square) and board.piece_at(target_square):
-                    discovered_attack_score += piece_values[board.piece_at(target_square).piece_type]
 
-    result[index] = discovered_attack_score
+    # Pieces worth more than a pawn and more than a knight
+    above_pawn = board.knights | board.bishops | board.rooks | board.queens
+    above_knight = board.rooks | board.queens
 
-def evaluate_tactics(board):
-    if board.is_game_over() or board.fullmove_number < 5:
-        return 0  # Skip tactics if the game is over or in very early moves.
+    for square in chess.scan_forward(board.pawns):
+        targets = board.attacks_mask(square) & above_pawn
+        if targets & (targets - 1):
+            fork_score += mask_value(board, targets)
 
-    # Precompute attacks for all pieces
-    attacks_cache = {square: board.attacks(square) for square in chess.SQUARES}
+    for square in chess.scan_forward(board.knights):
+        targets = board.attacks_mask(square) & above_knight
+        if targets & (targets - 1):
+            fork_score += mask_value(board, targets)
 
-    # Only evaluate tactics when there are queens or rooks on the board
-    if not (board.pieces(chess.QUEEN, chess.WHITE) or board.pieces(chess.QUEEN, chess.BLACK) or 
-            board.pieces(chess.ROOK, chess.WHITE) or board.pieces(chess.ROOK, chess.BLACK)):
-        return 0  # Skip tactics when there are no major attacking pieces left
+    pinned = pinned_mask(board, not board.turn)
+    for square in chess.scan_forward(board.bishops | board.rooks | board.queens):
+        targets = board.attacks_mask(square) & occupied
+        skewer_score += mask_value(board, targets & pinned)
+        if pinned & chess.BB_SQUARES[square]:
+            discovered_attack_score += mask_value(board, targets)
+
+    return fork_score, skewer_score, skewer_score, discovered_attack_score
 
-    result = [0] * 4 
+def evaluate_tactics(board):
+    if board.fullmove_number < 5:
+        return 0  # Skip tactics in very early moves.
 
-    # Start threads for each tactic
-    threads = []
-    threads.append(threading.Thread(target=detect_forks, args=(board, attacks_cache, result, 0)))
-    threads.append(threading.Thread(target=detect_skewers, args=(board, attacks_cache, result, 1)))
-    threads.append(threading.Thread(target=detect_pins, args=(board, attacks_cache, result, 2)))
-    threads.append(threading.Thread(target=detect_discovered_attacks, args=(board, attacks_cache, result, 3)))
+    # Only evaluate tactics when there are queens or rooks on the board
+    if not (board.queens or board.rooks):
+        return 0  # Skip tactics when there are no major attacking pieces left
 
-    # Start all threads
-    for thread in threads:
-        thread.start()
+    if board.is_game_over():
+        return 0  # Skip tactics if the game is over.
 
-    # Wait for all threads to finish
-    for thread in threads:
-        thread.join()
-      
-    total_score = sum(result)
+    total_score = sum(tactic_components(board))
 
     return total_score * 2
+
+def static_exchange_evaluation(board, move, values=piece_values):
+    """
+    Static exchange evaluation: the material the side to move wins (or loses, if negative)
+    when both sides keep recapturing on the target square of move, least valuable attacker
+    first, and either side may stop capturing when that is better for it. Pins are ignored.
+
+    Arguments:
+    board: chess.Board() object with move not yet made.
+    move: The capture (or promotion) to evaluate.
+    values: Piece values to count the exchange in. Defaults to tactics.piece_values.
+
+    Returns:
+    int: Net material gain of the exchange for the side to move.
+    """
+    to_square = move.to_square
+    occupied = board.occupied ^ chess.BB_SQUARES[move.from_square]
+
+    if board.is_en_passant(move):
+        captured_square = to_square - 8 if board.turn == chess.WHITE else to_square + 8
+        occupied ^= chess.BB_SQUARES[captured_square]
+        first_gain = values[chess.PAWN]
+    else:
+        captured_type = board.piece_type_at(to_square)
+        first_gain = values[captured_type] if captured_type else 0
+
+    if move.promotion:
+        first_gain += values[move.promotion] - values[chess.PAWN]
+        on_square = values[move.promotion]
+    else:
+        on_square = values[board.piece_type_at(move.from_square)]
+
+    gains = [first_gain]
+    side = not board.turn
+    while True:
+        attackers = board.attackers_mask(side, to_square, occupied) & occupied
+        if not attackers:
+            break
+
+        # Recapture with the least valuable attacker
+        for piece_type in chess.PIECE_TYPES:
+            candidates = attackers & board.pieces_mask(piece_type, side)
+            if candidates:
+                break
+        square = chess.lsb(candidates)
+        if piece_type == chess.KING and board.attackers_mask(not side, to_square, occupied ^ chess.BB_SQUARES[square]) & occupied:
+            break  # The king cannot recapture onto a defended square
+
+        gains.append(on_square - gains[-1])
+        on_square = values[piece_type]
+        occupied ^= chess.BB_SQUARES[square]
+        side = not side
+
+    # Each side only continues the exchange while it gains from it
+    while len(gains) > 1:
+        last = gains.pop()
+        gains[-1] = -max(-gains[-1], last)
+    return gains[0]
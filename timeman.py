@@ -0,0 +1,35 @@
+DEFAULT_MOVES_TO_GO = 30  # Assume this many moves remain when the clock has no move counter
+INCREMENT_USAGE = 0.75  # Fraction of the increment spent on the current move
+HARD_LIMIT_FACTOR = 3.0  # The hard deadline may stretch the soft budget this much
+MAX_TIME_FRACTION = 0.3  # Never spend more than this fraction of the remaining clock on one move
+MOVE_OVERHEAD = 0.05  # Seconds kept in reserve for communication lag
+MIN_THINK_TIME = 0.01
+
+def allocate_time(time_left=None, increment=0.0, movetime=None, moves_to_go=None):
+    """
+    Splits the clock into a budget for the current move.
+
+    Arguments:
+    time_left: Seconds left on the bot's clock, or None for an untimed search.
+    increment: Seconds added to the clock after each move.
+    movetime: Fixed number of seconds for this move; overrides the clock.
+    moves_to_go: Moves until the next time control, if known.
+
+    Returns:
+    tuple: (soft_limit, hard_limit) in seconds. No new iteration is started after the soft
+    limit, the search is aborted at the hard limit. Both are None for an untimed search.
+    """
+    if movetime is not None:
+        budget = max(movetime - MOVE_OVERHEAD, MIN_THINK_TIME)
+        return budget, budget
+
+    if time_left is None:
+        return None, None
+
+    usable = max(time_left - MOVE_OVERHEAD, MIN_THINK_TIME)
+    moves = moves_to_go if moves_to_go else DEFAULT_MOVES_TO_GO
+
+    soft_limit = usable / moves + increment * INCREMENT_USAGE
+    hard_limit = min(soft_limit * HARD_LIMIT_FACTOR, usable * MAX_TIME_FRACTION + increment * INCREMENT_USAGE, usable)
+    soft_limit = min(soft_limit, hard_limit)
+    return max(soft_limit, MIN_THINK_TIME), max(hard_limit, MIN_THINK_TIME)
@@ -0,0 +1,283 @@
+import struct
+from multiprocessing import shared_memory
+import chess
+import chess.polyglot
+
+# Bound types stored with each entry
+EXACT = 0
+LOWER_BOUND = 1  # Score is at least this value (fail high)
+UPPER_BOUND = 2  # Score is at most this value (fail low)
+
+def table_size(count):
+    """
+    Rounds a slot count down to a power of two (at least 1), so a table index is a simple mask.
+    """
+    return 1 << (max(1, count).bit_length() - 1)
+
+# Approximate CPython footprint of one slot: the entry tuple plus its key and score objects
+ENTRY_SIZE_BYTES = 160
+
+# Each bucket holds a depth-preferred slot followed by an always-replace slot
+BUCKET_SIZE = 2
+
+DEFAULT_SIZE_MB = 64
+
+def board_hash(board):
+    """
+    Returns the Zobrist hash used to key the transposition table.
+    """
+    return chess.polyglot.zobrist_hash(board)
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table keyed by the board's Zobrist hash.
+
+    Entries are tuples of (key, depth, score, bound, move, generation). Every bucket
+    has two slots: the first keeps the deepest result seen for the bucket (entries from
+    older searches can always be overwritten), the second is replaced unconditionally.
+    """
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB):
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        """
+        Reallocates the table to roughly size_mb megabytes, discarding all entries.
+        """
+        self.bucket_count = table_size(int(size_mb * 1024 * 1024) // (ENTRY_SIZE_BYTES * BUCKET_SIZE))
+        self.size_mb = size_mb
+        self._mask = self.bucket_count - 1
+        self.clear()
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        self._slots = [None] * (self.bucket_count * BUCKET_SIZE)
+        self.generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def new_search(self):
+        """
+        Marks the start of a new search so entries from earlier searches become replaceable.
+        """
+        self.generation += 1
+
+    def probe(self, key):
+        """
+        Returns the entry stored for key, or None if the position is not in the table.
+        A miss on a bucket that holds other positions is also counted as a collision.
+        """
+        index = (key & self._mask) * BUCKET_SIZE
+        slots = self._slots
+        deep = slots[index]
+        if deep is not None and deep[0] == key:
+            self.hits += 1
+            return deep
+        recent = slots[index + 1]
+        if recent is not None and recent[0] == key:
+            self.hits += 1
+            return recent
+
+        self.misses += 1
+        if deep is not None or recent is not None:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """
+        Stores a search result using the depth-preferred / always-replace policy.
+        """
+        index = (key & self._mask) * BUCKET_SIZE
+        slots = self._slots
+        entry = (key, depth, score, bound, move, self.generation)
+        self.stores += 1
+
+        deep = slots[index]
+        if deep is None or deep[0] == key or depth >= deep[1] or deep[5] != self.generation:
+            # Keep the displaced result of another position in the always-replace slot
+            if deep is not None and deep[0] != key:
+                slots[index + 1] = deep
+            slots[index] = entry
+        else:
+            slots[index + 1] = entry
+
+    def hashfull(self):
+        """
+        Returns the permille of slots filled during the current search.
+        """
+        sample = self._slots[:1000 * BUCKET_SIZE]
+        used = sum(1 for entry in sample if entry is not None and entry[5] == self.generation)
+        return used * 1000 // len(sample)
+
+    def stats(self):
+        """
+        Returns the hit/miss/collision counters as a dictionary.
+        """
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
+
+# Shared table slot: check word, packed depth/bound/generation/move, score
+SHARED_ENTRY = struct.Struct("<QQd")
+SHARED_HEADER_BYTES = 8  # Generation counter of the owning process
+SLOT_USED = 1 << 48  # Set in the data word of every written slot
+
+def encode_move(move):
+    """
+    Packs a move into 16 bits: from square, to square and promotion piece type. 0 is no move.
+    """
+    if move is None:
+        return 0
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+def decode_move(code):
+    if not code:
+        return None
+    return chess.Move(code & 63, code >> 6 & 63, code >> 12 or None)
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table kept in a multiprocessing.shared_memory block so several search
+    processes can read and write the same entries (Lazy SMP).
+
+    Slots are fixed-size records of SHARED_ENTRY. Writes are not locked: the first word of a
+    slot is the key XORed with the other two words, so a slot torn by concurrent writers no
+    longer matches its key and simply reads as a miss.
+
+    The process that creates the table owns it and starts new searches; processes attached
+    with name= pick up the owner's generation when they call new_search, so aging agrees
+    across processes.
+    """
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB, name=None):
+        self._shm = None
+        self._owner = name is None
+        self._name = name
+        self.resize(size_mb)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def resize(self, size_mb):
+        """
+        Reallocates the shared block to roughly size_mb megabytes. Only the owner may resize;
+        attached processes must attach again under the new name.
+        """
+        self.bucket_count = table_size(int(size_mb * 1024 * 1024) // (SHARED_ENTRY.size * BUCKET_SIZE))
+        self.size_mb = size_mb
+        self._mask = self.bucket_count - 1
+
+        size = SHARED_HEADER_BYTES + self.bucket_count * BUCKET_SIZE * SHARED_ENTRY.size
+        if self._owner:
+            self.close()
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self.clear()
+        else:
+            self._shm = shared_memory.SharedMemory(name=self._name)
+            self._buffer = self._shm.buf
+            self.generation = self._buffer[0]
+            self.reset_stats()
+
+    def clear(self):
+        """
+        Zeroes every slot and resets the counters. Must only be called by the owner while no
+        other process is searching.
+        """
+        self._buffer = self._shm.buf
+        self._buffer[:] = bytes(len(self._buffer))
+        self.generation = 0
+        self.reset_stats()
+
+    def new_search(self):
+        """
+        The owner advances the shared generation; attached processes adopt it.
+        """
+        if self._owner:
+            self.generation = (self.generation + 1) & 0xFF
+            self._buffer[0] = self.generation
+        else:
+            self.generation = self._buffer[0]
+
+    def _read(self, offset):
+        check, data, score = SHARED_ENTRY.unpack_from(self._buffer, offset)
+        if not data & SLOT_USED:
+            return None
+        key = check ^ data ^ _score_bits(score)
+        return (key, data & 0xFFFF, score, data >> 16 & 0xFF, decode_move(data >> 32 & 0xFFFF), data >> 24 & 0xFF)
+
+    def _write(self, offset, entry):
+        key, depth, score, bound, move, generation = entry
+        data = depth | bound << 16 | generation << 24 | encode_move(move) << 32 | SLOT_USED
+        SHARED_ENTRY.pack_into(self._buffer, offset, key ^ data ^ _score_bits(score), data, score)
+
+    def _offset(self, key):
+        return SHARED_HEADER_BYTES + (key & self._mask) * BUCKET_SIZE * SHARED_ENTRY.size
+
+    def probe(self, key):
+        offset = self._offset(key)
+        deep = self._read(offset)
+        if deep is not None and deep[0] == key:
+            self.hits += 1
+            return deep
+        recent = self._read(offset + SHARED_ENTRY.size)
+        if recent is not None and recent[0] == key:
+            self.hits += 1
+            return recent
+
+        self.misses += 1
+        if deep is not None or recent is not None:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        offset = self._offset(key)
+        entry = (key, max(depth, 0), score, bound, move, self.generation)
+        self.stores += 1
+
+        deep = self._read(offset)
+        if deep is None or deep[0] == key or depth >= deep[1] or deep[5] != self.generation:
+            if deep is not None and deep[0] != key:
+                self._write(offset + SHARED_ENTRY.size, deep)
+            self._write(offset, entry)
+        else:
+            self._write(offset + SHARED_ENTRY.size, entry)
+
+    def hashfull(self):
+        slots = min(1000, self.bucket_count) * BUCKET_SIZE
+        used = 0
+        for slot in range(slots):
+            entry = self._read(SHARED_HEADER_BYTES + slot * SHARED_ENTRY.size)
+            if entry is not None and entry[5] == self.generation:
+                used += 1
+        return used * 1000 // slots
+
+    def close(self):
+        """
+        Detaches from the shared block; the owner also frees it.
+        """
+        if self._shm is None:
+            return
+        self._buffer = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+def _score_bits(score):
+    return _SCORE_BITS.unpack(_SCORE.pack(score))[0]
+
+_SCORE = struct.Struct("<d")
+_SCORE_BITS = struct.Struct("<Q")
@@ -0,0 +1,282 @@
+import sys
+import threading
+import time
+import chess
+import engine
+import timeman
+
+ENGINE_NAME = "Orange Horizon"
+ENGINE_AUTHOR = "terminator3576"
+CENTIPAWN = engine.PIECE_VALUES[chess.PAWN] / 100  # Engine score units per centipawn
+MIN_HASH_MB = 1
+MAX_HASH_MB = 4096
+# Search scores at least this large are forced mates: engine.MATE_SCORE less the plies to mate
+MATE_RANGE = engine.MATE_SCORE - engine.MAX_SEARCH_DEPTH
+
+def parse_go(tokens):
+    """
+    Parses the arguments of a UCI go command into a dictionary. Times are converted from
+    milliseconds to seconds; ponder and infinite are flags.
+    """
+    limits = {"ponder": False, "infinite": False}
+    index = 0
+    while index < len(tokens):
+        name = tokens[index]
+        if name in ("ponder", "infinite"):
+            limits[name] = True
+            index += 1
+            continue
+        if name == "searchmoves":
+            break  # Not supported; the rest of the line is the move list
+        if index + 1 < len(tokens):
+            value = int(tokens[index + 1])
+            if name in ("wtime", "btime", "winc", "binc", "movetime"):
+                limits[name] = value / 1000
+            else:
+                limits[name] = value
+        index += 2
+    return limits
+
+def format_score(score):
+    """
+    UCI score of a search score from the side to move's view: "mate N" for mate scores, with N
+    in moves and negative when the side to move gets mated, else "cp N".
+    """
+    if abs(score) >= MATE_RANGE:
+        moves = max(1, (engine.MATE_SCORE - abs(score) + 1) // 2)
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {round(score / CENTIPAWN)}"
+
+def format_info(depth, score, pv, nodes, elapsed):
+    """
+    Formats an info line for a completed iteration; score is from the side to move's view.
+    """
+    milliseconds = int(elapsed * 1000)
+    nps = int(nodes / elapsed) if elapsed > 0 else 0
+    moves = " ".join(move.uci() for move in pv)
+    return (f"info depth {depth} score {format_score(score)} nodes {nodes} nps {nps} "
+            f"time {milliseconds} hashfull {engine.transposition_table.hashfull()} pv {moves}")
+
+class UCIEngine:
+    """
+    UCI protocol front-end. Commands are read on the calling thread and searches run on a
+    background thread, so stop and ponderhit are handled while the engine is thinking.
+    The engine's tables, opening book and worker pools stay warm between moves.
+
+    During go ponder and go infinite the search runs without a time limit and bestmove is
+    held back until stop (or ponderhit, after which the clock of the pondered go applies).
+    """
+
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.board = chess.Board()
+        self._output_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._release = threading.Event()  # Set by stop or ponderhit to let bestmove out
+        self._limits = None
+        self._pondering = False
+        self._soft_deadline = None
+        self._hard_deadline = None
+
+    def send(self, line):
+        with self._output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, lines=sys.stdin):
+        """
+        Reads commands until quit or the end of input.
+        """
+        # Worker processes forked while this thread blocks reading stdin would hang on startup
+        # (they close their copy of stdin, whose lock is held), so start the pool first
+        if engine.MATE_SEARCH_BACKEND == "full-width":
+            engine.get_mate_pool()
+        for line in lines:
+            if not self.handle(line):
+                break
+        self.stop_search()
+
+    def handle(self, line):
+        """
+        Executes one command line. Returns False when the engine should exit. A malformed
+        command (bad number, FEN or move) is reported with an info string and ignored.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        try:
+            return self.execute(tokens[0], tokens[1:])
+        except ValueError as error:
+            self.send(f"info string ignoring {line.strip()!r}: {error}")
+            return True
+
+    def execute(self, command, arguments):
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {engine.TT_SIZE_MB} min {MIN_HASH_MB} max {MAX_HASH_MB}")
+            self.send("option name Ponder type check default false")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(arguments)
+        elif command == "ucinewgame":
+            self.stop_search()
+            engine.transposition_table.clear()
+            engine.pawn_hash_table.clear()
+            engine.evaluation_cache.clear()
+            engine.move_orderer.clear()
+        elif command == "position":
+            self.stop_search()
+            self.set_position(arguments)
+        elif command == "go":
+            self.stop_search()
+            self.start_search(parse_go(arguments))
+        elif command == "stop":
+            self.stop_search()
+        elif command == "ponderhit":
+            self.ponderhit()
+        elif command == "quit":
+            return False
+        return True
+
+    def set_option(self, arguments):
+        line = " ".join(arguments)
+        if " value " not in line:
+            return
+        name, value = line.split(" value ", 1)
+        name = name.replace("name", "", 1).strip().lower()
+        if name == "hash":
+            size_mb = min(max(int(value), MIN_HASH_MB), MAX_HASH_MB)
+            engine.TT_SIZE_MB = size_mb
+            engine.transposition_table.resize(size_mb)
+
+    def set_position(self, arguments):
+        if not arguments:
+            return
+        if arguments[0] == "startpos":
+            board = chess.Board()
+            rest = arguments[1:]
+        elif arguments[0] == "fen":
+            fen_fields = []
+            rest = arguments[1:]
+            while rest and rest[0] != "moves":
+                fen_fields.append(rest.pop(0))
+            board = chess.Board(" ".join(fen_fields))
+        else:
+            return
+        if rest and rest[0] == "moves":
+            for uci_move in rest[1:]:
+                board.push_uci(uci_move)
+        self.board = board
+
+    def set_deadlines(self, start_time):
+        """
+        Sets the soft and hard deadlines of the running search from the go limits.
+        """
+        limits = self._limits
+        if self.board.turn == chess.WHITE:
+            time_left, increment = limits.get("wtime"), limits.get("winc", 0.0)
+        else:
+            time_left, increment = limits.get("btime"), limits.get("binc", 0.0)
+        soft_limit, hard_limit = timeman.allocate_time(time_left, increment, limits.get("movetime"),
+                                                       limits.get("movestogo"))
+        self._soft_deadline = start_time + soft_limit if soft_limit is not None else None
+        self._hard_deadline = start_time + hard_limit if hard_limit is not None else None
+
+    def start_search(self, limits):
+        self._limits = limits
+        self._pondering = limits["ponder"]
+        self._stop.clear()
+        self._release.clear()
+        self._soft_deadline = self._hard_deadline = None
+        if not self._pondering:
+            self.set_deadlines(time.time())
+        self._thread = threading.Thread(target=self.search, args=(self.board.copy(),), daemon=True)
+        self._thread.start()
+
+    def stop_search(self):
+        """
+        Stops the running search, if any, and waits for its bestmove.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._release.set()
+        self._thread.join()
+        self._thread = None
+
+    def ponderhit(self):
+        """
+        The opponent played the pondered move: the search goes on under the normal clock.
+        """
+        if not self._pondering:
+            return
+        self.set_deadlines(time.time())
+        self._pondering = False
+        self._release.set()
+
+    def stop_requested(self):
+        if self._stop.is_set():
+            return True
+        return self._hard_deadline is not None and time.time() >= self._hard_deadline
+
+    def search(self, board):
+        """
+        Body of the search thread: finds the move, streams info lines and sends bestmove.
+        """
+        start_time = time.time()
+        limits = self._limits
+        unlimited = limits["infinite"] or self._pondering
+        best_move = None
+        ponder_move = None
+        root_moves = engine.RootMoves(board)
+
+        if not unlimited and "depth" not in limits:
+            soft_limit = self._soft_deadline - start_time if self._soft_deadline is not None else None
+            best_move = engine.find_forced_move(board, soft_limit, root_moves)
+
+        if best_move is None and root_moves.moves:
+            iteration_start = [start_time]
+
+            def report(depth, score, pv):
+                now = time.time()
+                nodes = engine.stats.nodes + engine.stats.quiescence_nodes
+                self.send(format_info(depth, score, pv, nodes, now - start_time))
+                last_iteration = now - iteration_start[0]
+                iteration_start[0] = now
+                if self._pondering or self._soft_deadline is None:
+                    return False
+                # The next iteration takes several times longer than this one did
+                return now >= self._soft_deadline or now + last_iteration * 2 > self._soft_deadline
+
+            max_depth = limits.get("depth", engine.MAX_SEARCH_DEPTH)
+            _, best_move, _ = engine.iterative_deepening(board, max_depth, start_time=start_time,
+                                                         stop=self.stop_requested, report=report,
+                                                         root_moves=root_moves)
+            pv = engine.extract_pv(board, 2)
+            if len(pv) == 2 and pv[0] == best_move:
+                ponder_move = pv[1]
+
+        # Under ponder and infinite, bestmove waits for stop or ponderhit
+        while (limits["infinite"] or self._pondering) and not self._stop.is_set():
+            self._release.wait()
+            self._release.clear()
+
+        if best_move is None:
+            self.send("bestmove 0000")
+        elif ponder_move is not None:
+            self.send(f"bestmove {best_move.uci()} ponder {ponder_move.uci()}")
+        else:
+            self.send(f"bestmove {best_move.uci()}")
+
+def main():
+    # Anything the engine prints goes to stderr; stdout carries the protocol only
+    protocol_output = sys.stdout
+    sys.stdout = sys.stderr
+    UCIEngine(protocol_output).run()
+
+if __name__ == "__main__":
+    main()